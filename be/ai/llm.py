@@ -1,21 +1,57 @@
+import asyncio
 import os
+from threading import Lock, Thread
+from typing import Any, Coroutine, Optional, TypeVar
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+LLM_MODEL = "openrouter/sherlock-dash-alpha"
+LLM_CONCURRENCY = 8  # max in-flight async LLM requests, to respect provider rate limits
+
+# One pooled HTTP/2 connection set shared by every respond() call, so concurrent
+# LLM requests multiplex over warm connections instead of re-handshaking TLS.
+_http_client = httpx.Client(
+  http2=True,
+  limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+  timeout=httpx.Timeout(60.0, connect=5.0),
+)
 
 client = OpenAI(
   base_url="https://openrouter.ai/api/v1",
   api_key=OPENROUTER_API_KEY,
+  http_client=_http_client,
+)
+
+# Async twin of the client above. httpx.AsyncClient connections belong to the
+# event loop that opened them, so every coroutine runs on one long-lived loop
+# (see run_async) instead of a fresh asyncio.run() per call.
+_async_http_client = httpx.AsyncClient(
+  http2=True,
+  limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+  timeout=httpx.Timeout(60.0, connect=5.0),
+)
+
+async_client = AsyncOpenAI(
+  base_url="https://openrouter.ai/api/v1",
+  api_key=OPENROUTER_API_KEY,
+  http_client=_async_http_client,
 )
 
+_llm_semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = Lock()
+
+T = TypeVar("T")
+
 def respond(prompt: str) -> str:
     completion = client.chat.completions.create(
     extra_body={},
-    model="openrouter/sherlock-dash-alpha",
+    model=LLM_MODEL,
     messages=[
                 {
                     "role": "user",
@@ -36,4 +72,30 @@ def respond(prompt: str) -> str:
     )
     return completion.choices[0].message.content
 
+async def respond_async(prompt: str) -> str:
+    """Async respond(); at most LLM_CONCURRENCY calls are in flight at once."""
+    async with _llm_semaphore:
+        completion = await async_client.chat.completions.create(
+            extra_body={},
+            model=LLM_MODEL,
+            messages=[{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+        )
+    return completion.choices[0].message.content
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the shared LLM event loop on a daemon thread the first time it is needed."""
+    global _loop
+    
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            Thread(target=_loop.run_forever, name="clarity-llm-loop", daemon=True).start()
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared LLM loop and block the calling (worker) thread for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
 # print(respond("what is 1+1?"))
\ No newline at end of file
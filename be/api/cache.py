@@ -0,0 +1,129 @@
+"""
+Short-lived read cache for brand routes.
+
+Dashboards poll the same brand endpoints repeatedly while data only changes
+when a scrape is saved, so reads are served from a TTL cache that is cleared
+on every write.
+
+Scrape status checks are coalesced instead: concurrent clients polling the
+same Browser.cash tasks share one upstream fan-out and its short-lived result.
+"""
+
+from concurrent.futures import Future
+from threading import Lock, RLock
+from typing import List, Dict, Any, Optional, Tuple
+
+from cachetools import TTLCache, cached
+from cachetools.keys import hashkey
+
+from db import get_brand_data, get_brand_data_range, list_brands, get_latest_data
+from db.database import get_brand_stats
+from scraper import check_scraping_status
+
+
+brands_cache = TTLCache(maxsize=1024, ttl=60)
+_cache_lock = RLock()
+
+
+def _key(name: str):
+    """Build a cache key function namespaced by the wrapped function name."""
+    return lambda *args, **kwargs: hashkey(name, *args, **kwargs)
+
+
+@cached(brands_cache, key=_key("list_brands"), lock=_cache_lock)
+def cached_list_brands() -> List[Dict[str, Any]]:
+    return list_brands()
+
+
+@cached(brands_cache, key=_key("get_brand_data"), lock=_cache_lock)
+def cached_get_brand_data(brand_name: str, date: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    return get_brand_data(brand_name, date, limit)
+
+
+@cached(brands_cache, key=_key("get_brand_data_range"), lock=_cache_lock)
+def cached_get_brand_data_range(
+    brand_name: str,
+    start_date: str,
+    end_date: str,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    return get_brand_data_range(brand_name, start_date, end_date, limit)
+
+
+@cached(brands_cache, key=_key("get_latest_data"), lock=_cache_lock)
+def cached_get_latest_data(
+    brand_name: str,
+    limit: int,
+    offset: int = 0,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    return get_latest_data(brand_name, limit, offset, before)
+
+
+@cached(brands_cache, key=_key("get_brand_stats"), lock=_cache_lock)
+def cached_get_brand_stats(
+    brand_name: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    return get_brand_stats(brand_name, start_date, end_date)
+
+
+def invalidate_brand_cache() -> None:
+    """Drop all cached reads. Call after any successful save_brand_data."""
+    with _cache_lock:
+        brands_cache.clear()
+
+
+STATUS_SNAPSHOT_TTL = 2  # seconds a Browser.cash status snapshot is shared
+
+_status_cache: "TTLCache[Tuple, Dict[str, Any]]" = TTLCache(maxsize=256, ttl=STATUS_SNAPSHOT_TTL)
+_status_inflight: Dict[Tuple, Future] = {}
+_status_lock = Lock()
+
+
+def coalesced_check_scraping_status(task_ids: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    check_scraping_status with single-flight coalescing per task set.
+    
+    The first caller for a set of task ids polls Browser.cash; callers that
+    arrive while it runs wait for its result, and callers within
+    STATUS_SNAPSHOT_TTL seconds afterwards reuse it.
+    
+    Args:
+        task_ids: Dict of source -> task info (as returned by scrape_brand)
+    
+    Returns:
+        Dict of source -> status info
+    """
+    key = tuple(sorted(
+        (source, info.get("task_id") if isinstance(info, dict) else str(info))
+        for source, info in task_ids.items()
+    ))
+    
+    with _status_lock:
+        snapshot = _status_cache.get(key)
+        if snapshot is not None:
+            return snapshot
+        
+        future = _status_inflight.get(key)
+        owner = future is None
+        if owner:
+            future = _status_inflight[key] = Future()
+    
+    if not owner:
+        return future.result()
+    
+    try:
+        snapshot = check_scraping_status(task_ids)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _status_lock:
+            _status_inflight.pop(key, None)
+    
+    with _status_lock:
+        _status_cache[key] = snapshot
+    future.set_result(snapshot)
+    return snapshot
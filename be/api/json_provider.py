@@ -0,0 +1,95 @@
+"""
+orjson-backed JSON provider for Flask responses, plus a fast request body parser.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator
+
+import orjson
+from flask import request
+from flask.json.provider import JSONProvider
+
+
+_DUMPS_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Serialize responses with orjson instead of the stdlib json module.
+    
+    orjson handles datetime, date, UUID and dataclasses natively and writes
+    bytes directly, which avoids an extra str encode for every response.
+    """
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode()
+    
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS),
+            mimetype="application/json"
+        )
+
+
+def json_body() -> Any:
+    """
+    Parse the current request body with orjson.
+    
+    Skips request.get_json()'s str decode and caching. Returns None for an
+    empty or malformed body so routes can answer with their usual 400.
+    """
+    body = request.get_data(cache=False)
+    if not body:
+        return None
+    
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def stream_json_array(
+    header: Dict[str, Any],
+    items: Iterable[Any],
+    key: str = "data",
+    chunk_size: int = 256
+) -> Iterator[bytes]:
+    """
+    Encode {**header, key: [...items], "count": n} incrementally.
+    
+    Items are serialized chunk_size at a time, so the full response body is
+    never held in memory and the first bytes go out before the last item is
+    encoded. "count" is written last, once the number of items is known.
+    """
+    prefix = orjson.dumps(header, default=_default, option=_DUMPS_OPTIONS)[:-1]
+    yield prefix + (b"," if header else b"") + orjson.dumps(key) + b":["
+    
+    count = 0
+    chunk = []
+    for item in items:
+        chunk.append(orjson.dumps(item, default=_default, option=_DUMPS_OPTIONS))
+        if len(chunk) >= chunk_size:
+            yield (b"," if count else b"") + b",".join(chunk)
+            count += len(chunk)
+            chunk = []
+    
+    if chunk:
+        yield (b"," if count else b"") + b",".join(chunk)
+        count += len(chunk)
+    
+    yield b'],"count":' + str(count).encode() + b"}"
@@ -1,17 +1,22 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from datetime import datetime, timedelta
 from typing import Dict, Any
 import json
 
-from db import (
-    save_brand_data,
-    get_brand_data,
-    get_brand_data_range,
-    list_brands,
-    get_latest_data
+from db import save_brand_data, bulk_save_brand_data
+from db.models import SCRAPE_SOURCES
+from scraper import scrape_brand, parse_scrape_result, parse_scrape_results
+from api.task_manager import task_manager
+from api.json_provider import json_body, stream_json_array
+from api.cache import (
+    cached_list_brands,
+    cached_get_brand_data,
+    cached_get_brand_data_range,
+    cached_get_latest_data,
+    cached_get_brand_stats,
+    coalesced_check_scraping_status,
+    invalidate_brand_cache
 )
-from db.database import get_brand_stats
-from scraper import scrape_brand, check_scraping_status, parse_scrape_result
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -25,7 +30,7 @@ def get_brands():
         JSON response with list of brand names
     """
     try:
-        brands = list_brands()
+        brands = cached_list_brands()
         return jsonify({
             "brands": brands,
             "count": len(brands)
@@ -46,34 +51,32 @@ def get_brand_reputation_data(brand_name: str):
         - limit: Max number of results
     
     Returns:
-        JSON response with reputation data
+        JSON response with reputation data (streamed)
     """
     try:
         date = request.args.get('date')
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
-        limit = request.args.get('limit', type=int)
+        limit = request.args.get('limit', type=int) or None
         
         if date:
-            data = get_brand_data(brand_name, date)
+            data = cached_get_brand_data(brand_name, date, limit)
         elif start_date and end_date:
-            data = get_brand_data_range(brand_name, start_date, end_date)
+            data = cached_get_brand_data_range(brand_name, start_date, end_date, limit)
         elif start_date:
             end = datetime.now().strftime("%Y-%m-%d")
-            data = get_brand_data_range(brand_name, start_date, end)
+            data = cached_get_brand_data_range(brand_name, start_date, end, limit)
         else:
             start = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
             end = datetime.now().strftime("%Y-%m-%d")
-            data = get_brand_data_range(brand_name, start, end)
+            data = cached_get_brand_data_range(brand_name, start, end, limit)
         
-        if limit:
-            data = data[:limit]
-        
-        return jsonify({
-            "brand": brand_name,
-            "data": data,
-            "count": len(data)
-        }), 200
+        # Stream the array so large histories are encoded chunk by chunk
+        return Response(
+            stream_with_context(stream_json_array({"brand": brand_name}, data)),
+            status=200,
+            mimetype='application/json'
+        )
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -87,6 +90,7 @@ def get_brand_latest_data(brand_name: str):
     Query params:
         - limit: Max number of results (default: 10)
         - offset: Number of results to skip (default: 0)
+        - before: Only return entries scraped before this ISO timestamp (optional cursor)
     
     Returns:
         JSON response with latest reputation data
@@ -94,12 +98,13 @@ def get_brand_latest_data(brand_name: str):
     try:
         limit = request.args.get('limit', default=10, type=int)
         offset = request.args.get('offset', default=0, type=int)
-        data = get_latest_data(brand_name, limit + offset)
+        before = request.args.get('before')
+        data = cached_get_latest_data(brand_name, limit, offset, before)
         
         return jsonify({
             "brand": brand_name,
-            "data": data[offset:offset + limit],
-            "count": len(data[offset:offset + limit])
+            "data": data,
+            "count": len(data)
         }), 200
     
     except Exception as e:
@@ -122,7 +127,7 @@ def get_brand_statistics(brand_name: str):
         start_date = request.args.get('start_date')
         end_date = request.args.get('end_date')
         
-        stats = get_brand_stats(brand_name, start_date, end_date)
+        stats = cached_get_brand_stats(brand_name, start_date, end_date)
         
         return jsonify({
             "brand": brand_name,
@@ -148,7 +153,7 @@ def scrape_brand_data(brand_name: str):
         JSON response with task IDs and status
     """
     try:
-        data = request.get_json()
+        data = json_body()
         
         if not data or "sources" not in data:
             return jsonify({"error": "Missing 'sources' in request body"}), 400
@@ -159,13 +164,12 @@ def scrape_brand_data(brand_name: str):
         if not sources:
             return jsonify({"error": "At least one source must be specified"}), 400
         
-        valid_sources = ['trustpilot', 'yelp', 'google_reviews', 'news', 'blog', 'forum', 'website']
-        invalid = [s for s in sources if s not in valid_sources]
+        invalid = [s for s in sources if s not in SCRAPE_SOURCES]
         
         if invalid:
             return jsonify({
                 "error": f"Invalid sources: {invalid}",
-                "valid_sources": valid_sources
+                "valid_sources": sorted(SCRAPE_SOURCES)
             }), 400
         
         result = scrape_brand(brand_name, sources, website_url)
@@ -193,13 +197,13 @@ def check_scrape_status(brand_name: str):
         JSON response with updated task statuses
     """
     try:
-        data = request.get_json()
+        data = json_body()
         
         if not data or "task_ids" not in data:
             return jsonify({"error": "Missing 'task_ids' in request body"}), 400
         
         task_ids = data.get("task_ids")
-        results = check_scraping_status(task_ids)
+        results = coalesced_check_scraping_status(task_ids)
         
         return jsonify({
             "brand": brand_name,
@@ -236,7 +240,7 @@ def save_brand_reputation_data(brand_name: str):
     try:
         from db.models import ReputationEntry
         
-        data = request.get_json()
+        data = json_body()
         
         if not data or "entries" not in data:
             return jsonify({"error": "Missing 'entries' in request body"}), 400
@@ -246,14 +250,14 @@ def save_brand_reputation_data(brand_name: str):
         
         for entry_dict in entries_data:
             try:
-                entry = ReputationEntry.from_dict(entry_dict)
-                entries.append(entry)
+                entries.append(ReputationEntry.validate_dict(entry_dict))
             except Exception as e:
                 return jsonify({"error": f"Invalid entry: {str(e)}"}), 400
         
-        success = save_brand_data(brand_name, entries)
+        success = bulk_save_brand_data(brand_name, entries)
         
         if success:
+            invalidate_brand_cache()
             return jsonify({
                 "message": f"Saved {len(entries)} entries for {brand_name}",
                 "count": len(entries)
@@ -265,10 +269,52 @@ def save_brand_reputation_data(brand_name: str):
         return jsonify({"error": str(e)}), 500
 
 
+def _process_and_save(brand_name: str, source_type: str, raw_result: str, source_url: str) -> Dict[str, Any]:
+    """Run LLM post-processing for a scrape result and save the entries (worker thread)."""
+    entries = parse_scrape_result(raw_result, source_type, source_url, brand_name)
+    
+    if entries:
+        save_brand_data(brand_name, entries)
+        invalidate_brand_cache()
+    
+    return {
+        "message": f"Processed and saved {len(entries)} entries",
+        "brand": brand_name,
+        "source": source_type,
+        "count": len(entries),
+        "entries": [e.to_dict() for e in entries]
+    }
+
+
+def _process_and_save_all(
+    brand_name: str,
+    raw_results: Dict[str, str],
+    source_urls: Dict[str, str]
+) -> Dict[str, Any]:
+    """Run LLM post-processing for several sources' results concurrently and save them in one write (worker thread)."""
+    parsed = parse_scrape_results(raw_results, brand_name, source_urls)
+    entries = [entry for source_entries in parsed.values() for entry in source_entries]
+    
+    if entries:
+        save_brand_data(brand_name, entries)
+        invalidate_brand_cache()
+    
+    return {
+        "message": f"Processed and saved {len(entries)} entries",
+        "brand": brand_name,
+        "sources": {source: len(source_entries) for source, source_entries in parsed.items()},
+        "count": len(entries),
+        "entries": [e.to_dict() for e in entries]
+    }
+
+
 @api_bp.route('/scrape/process', methods=['POST'])
 def process_scrape_results():
     """
-    Process completed scraping results and save to database.
+    Queue processing of completed scraping results and saving to database.
+    
+    LLM post-processing runs on a background worker; poll the returned
+    status_url until the task is completed.
     
     Request body:
         {
@@ -278,18 +324,58 @@ def process_scrape_results():
             "source_url": "https://trustpilot.com/..."
         }
     
+    Or, for several sources at once (formatted with concurrent LLM calls):
+        {
+            "brand_name": "Example Brand",
+            "results": {"trustpilot": "...", "news": "..."},
+            "source_urls": {"trustpilot": "https://trustpilot.com/..."}  (optional)
+        }
+    
     Returns:
-        JSON response with processed entries
+        202 Accepted with task_id for polling
     """
     try:
-        from db.models import ReputationEntry
-        
-        data = request.get_json()
+        data = json_body()
         
         if not data:
             return jsonify({"error": "Missing request body"}), 400
         
         brand_name = data.get("brand_name")
+        
+        if "results" in data:
+            raw_results = data.get("results")
+            source_urls = data.get("source_urls")
+            if source_urls is None:
+                source_urls = {}
+            
+            if not brand_name or not raw_results or not isinstance(raw_results, dict):
+                return jsonify({"error": "Missing required fields: brand_name, results (source_type -> raw_result)"}), 400
+            
+            # Reject unknown sources before they reach the (paid) batched LLM call
+            invalid = [s for s in raw_results if s not in SCRAPE_SOURCES]
+            
+            if invalid:
+                return jsonify({
+                    "error": f"Invalid sources: {invalid}",
+                    "valid_sources": sorted(SCRAPE_SOURCES)
+                }), 400
+            
+            if not all(isinstance(raw, str) and raw for raw in raw_results.values()):
+                return jsonify({"error": "Each entry in 'results' must be a non-empty raw_result string"}), 400
+            if not isinstance(source_urls, dict) or not all(isinstance(url, str) for url in source_urls.values()):
+                return jsonify({"error": "'source_urls' must be an object of source_type -> URL string"}), 400
+            
+            task_id = task_manager.submit(_process_and_save_all, brand_name, raw_results, source_urls)
+            task_manager.cleanup_expired()
+            
+            return jsonify({
+                "task_id": task_id,
+                "brand": brand_name,
+                "sources": list(raw_results),
+                "status": "processing",
+                "status_url": f"/api/tasks/{task_id}"
+            }), 202
+        
         source_type = data.get("source_type")
         raw_result = data.get("raw_result")
         source_url = data.get("source_url", "")
@@ -297,18 +383,35 @@ def process_scrape_results():
         if not all([brand_name, source_type, raw_result]):
             return jsonify({"error": "Missing required fields: brand_name, source_type, raw_result"}), 400
         
-        entries = parse_scrape_result(raw_result, source_type, source_url)
-        
-        if entries:
-            save_brand_data(brand_name, entries)
+        task_id = task_manager.submit(_process_and_save, brand_name, source_type, raw_result, source_url)
+        task_manager.cleanup_expired()
         
         return jsonify({
-            "message": f"Processed and saved {len(entries)} entries",
+            "task_id": task_id,
             "brand": brand_name,
             "source": source_type,
-            "count": len(entries),
-            "entries": [e.to_dict() for e in entries]
-        }), 201
+            "status": "processing",
+            "status_url": f"/api/tasks/{task_id}"
+        }), 202
     
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@api_bp.route('/tasks/<task_id>', methods=['GET'])
+def get_task_status(task_id: str):
+    """
+    Get status and result of a background processing task.
+    
+    Returns:
+        - While processing: {"task_id", "status": "processing"}
+        - When complete: task state with "result"
+        - If failed: task state with "error"
+        - If not found: 404 error
+    """
+    task = task_manager.get_task(task_id)
+    
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    
+    return jsonify(task), 200
@@ -3,17 +3,34 @@ Search state manager for tracking active Browser.cash searches.
 """
 
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-from threading import Lock
+from typing import Deque, Dict, Any, Optional, Tuple
+from threading import Condition, Lock
 
 
 class SearchManager:
-    """Manages active search states in memory."""
+    """
+    Manages active search states in memory.
+    
+    Timestamps are stored as datetime objects; the app's JSON provider
+    formats them as ISO 8601 strings only when a response is serialized.
+    
+    Writes are copy-on-write: under the lock a new mapping (and a new search
+    dict for updates) is built and swapped in with a single reference
+    assignment. Published dicts are never mutated afterwards, so readers
+    dereference the current snapshot without taking the lock.
+    
+    State is process-local: the server runs a single worker process (see
+    README.md), and searches do not survive a restart.
+    """
     
     def __init__(self, expiry_minutes: int = 60):
         self._searches: Dict[str, Dict[str, Any]] = {}
-        self._lock = Lock()
+        self._lock = Lock()  # serializes writers only
+        self._updated = Condition(self._lock)
+        # (created_at, search_id) in creation order, so expiry only touches expired searches
+        self._by_time: Deque[Tuple[datetime, str]] = deque()
         self.expiry_minutes = expiry_minutes
     
     def create_search(
@@ -28,28 +45,36 @@ class SearchManager:
         
         Args:
             query: The search query (brand name)
-            task_ids: Dict of source -> task info from scrape_brand()
+            task_ids: Dict of source -> task info from scrape_brand(), or {} while
+                the tasks are still being created in the background
             auto_save: Whether to auto-save results to database
             sources: List of sources being searched
         
         Returns:
             Unique search_id
         """
-        search_id = str(uuid.uuid4())
+        search_id = uuid.uuid4().hex
+        created_at = datetime.now()
+        
+        search = {
+            "search_id": search_id,
+            "query": query,
+            "task_ids": task_ids,
+            "auto_save": auto_save,
+            "sources": sources or list(task_ids.keys()),
+            "status": "processing",
+            "created_at": created_at,
+            "results": None,
+            "stats": None,
+            "parse_tasks": {},
+            "saved_to_db": False
+        }
         
         with self._lock:
-            self._searches[search_id] = {
-                "search_id": search_id,
-                "query": query,
-                "task_ids": task_ids,
-                "auto_save": auto_save,
-                "sources": sources or list(task_ids.keys()),
-                "status": "processing",
-                "created_at": datetime.now().isoformat(),
-                "results": None,
-                "stats": None,
-                "saved_to_db": False
-            }
+            searches = dict(self._searches)
+            searches[search_id] = search
+            self._searches = searches
+            self._by_time.append((created_at, search_id))
         
         return search_id
     
@@ -61,10 +86,9 @@ class SearchManager:
             search_id: The unique search identifier
         
         Returns:
-            Search metadata dict or None if not found
+            Search metadata dict (treat as read-only) or None if not found
         """
-        with self._lock:
-            return self._searches.get(search_id)
+        return self._searches.get(search_id)
     
     def update_search(
         self,
@@ -72,7 +96,11 @@ class SearchManager:
         status: str = None,
         results: list = None,
         stats: dict = None,
-        saved_to_db: bool = None
+        saved_to_db: bool = None,
+        parse_tasks: dict = None,
+        task_ids: dict = None,
+        error: str = None,
+        progress: dict = None
     ) -> bool:
         """
         Update search metadata.
@@ -83,6 +111,10 @@ class SearchManager:
             results: List of result entries
             stats: Statistics dict
             saved_to_db: Whether results were saved
+            parse_tasks: Dict of source -> background LLM task_id
+            task_ids: Dict of source -> task info, once Browser.cash tasks are created
+            error: Failure reason when status is failed
+            progress: Per-source progress from the latest Browser.cash check
         
         Returns:
             True if updated successfully, False if not found
@@ -91,7 +123,7 @@ class SearchManager:
             if search_id not in self._searches:
                 return False
             
-            search = self._searches[search_id]
+            search = dict(self._searches[search_id])
             
             if status is not None:
                 search["status"] = status
@@ -101,11 +133,46 @@ class SearchManager:
                 search["stats"] = stats
             if saved_to_db is not None:
                 search["saved_to_db"] = saved_to_db
+            if parse_tasks is not None:
+                search["parse_tasks"] = parse_tasks
+            if task_ids is not None:
+                search["task_ids"] = task_ids
+            if error is not None:
+                search["error"] = error
+            if progress is not None:
+                search["progress"] = progress
             
-            search["updated_at"] = datetime.now().isoformat()
+            search["updated_at"] = datetime.now()
+            
+            searches = dict(self._searches)
+            searches[search_id] = search
+            self._searches = searches
+            self._updated.notify_all()
             
             return True
     
+    def wait_for_update(self, search_id: str, timeout: float) -> bool:
+        """
+        Block until the search is updated or removed, or timeout elapses.
+        
+        Args:
+            search_id: The unique search identifier
+            timeout: Maximum seconds to wait
+        
+        Returns:
+            True if the search changed, False on timeout
+        """
+        search = self._searches.get(search_id)
+        if search is None:
+            return True
+        
+        def changed() -> bool:
+            current = self._searches.get(search_id)
+            return current is not search
+        
+        with self._updated:
+            return self._updated.wait_for(changed, timeout=timeout)
+    
     def cleanup_expired(self) -> int:
         """
         Remove searches older than expiry_minutes.
@@ -114,21 +181,22 @@ class SearchManager:
             Number of searches removed
         """
         expiry_time = datetime.now() - timedelta(minutes=self.expiry_minutes)
-        removed_count = 0
         
         with self._lock:
             expired_ids = []
             
-            for search_id, search in self._searches.items():
-                created_at = datetime.fromisoformat(search["created_at"])
-                if created_at < expiry_time:
-                    expired_ids.append(search_id)
+            # Oldest first: stop at the first search that is still live
+            while self._by_time and self._by_time[0][0] < expiry_time:
+                _, search_id = self._by_time.popleft()
+                expired_ids.append(search_id)
             
-            for search_id in expired_ids:
-                del self._searches[search_id]
-                removed_count += 1
+            if expired_ids:
+                searches = dict(self._searches)
+                for search_id in expired_ids:
+                    searches.pop(search_id, None)
+                self._searches = searches
         
-        return removed_count
+        return len(expired_ids)
     
     def list_active_searches(self) -> list:
         """
@@ -137,13 +205,11 @@ class SearchManager:
         Returns:
             List of search metadata dicts
         """
-        with self._lock:
-            return list(self._searches.values())
+        return list(self._searches.values())
     
     def get_search_count(self) -> int:
         """Get total number of active searches."""
-        with self._lock:
-            return len(self._searches)
+        return len(self._searches)
 
 
 # Global search manager instance
@@ -0,0 +1,98 @@
+"""
+Background task manager for running blocking work (LLM post-processing) off the request thread.
+"""
+
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable
+from threading import Lock
+
+
+class TaskManager:
+    """Runs blocking jobs on a worker pool and tracks their state in memory."""
+
+    def __init__(self, max_workers: int = 8, expiry_minutes: int = 60):
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="clarity-task")
+        self.expiry_minutes = expiry_minutes
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> str:
+        """
+        Queue a job on the worker pool.
+
+        Args:
+            fn: Blocking callable to run
+            *args, **kwargs: Arguments forwarded to fn
+
+        Returns:
+            Unique task_id to poll with get_task()
+        """
+        task_id = uuid.uuid4().hex
+
+        with self._lock:
+            self._tasks[task_id] = {
+                "task_id": task_id,
+                "status": "processing",
+                "created_at": datetime.now(),
+                "result": None,
+                "error": None
+            }
+
+        self._executor.submit(self._run, task_id, fn, args, kwargs)
+
+        return task_id
+
+    def _run(self, task_id: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        """Execute a job and record its outcome."""
+        try:
+            result = fn(*args, **kwargs)
+            update = {"status": "completed", "result": result}
+        except Exception as e:
+            update = {"status": "failed", "error": str(e)}
+
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                task.update(update)
+                task["updated_at"] = datetime.now()
+
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve task state by ID.
+
+        Args:
+            task_id: The unique task identifier
+
+        Returns:
+            Copy of the task state dict or None if not found
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    def cleanup_expired(self) -> int:
+        """
+        Remove finished tasks older than expiry_minutes.
+
+        Returns:
+            Number of tasks removed
+        """
+        expiry_time = datetime.now() - timedelta(minutes=self.expiry_minutes)
+
+        with self._lock:
+            expired_ids = [
+                task_id for task_id, task in self._tasks.items()
+                if task["status"] != "processing"
+                and task["created_at"] < expiry_time
+            ]
+
+            for task_id in expired_ids:
+                del self._tasks[task_id]
+
+        return len(expired_ids)
+
+
+# Global task manager instance
+task_manager = TaskManager(max_workers=8, expiry_minutes=60)
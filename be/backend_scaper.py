@@ -1,7 +1,7 @@
 """
 Clarity Backend Batch Scraper
 
-Automatically scrapes a list of brands sequentially, populating the database.
+Automatically scrapes a list of brands concurrently, populating the database.
 Similar to the UI flow but fully automated for testing and data population.
 
 Usage:
@@ -9,10 +9,11 @@ Usage:
     python backend_scaper.py --cleanup-delay 10
     python backend_scaper.py --dry-run
     python backend_scaper.py --max-brands 5
+    python backend_scaper.py --concurrency 8
 """
 
-import requests
-import time
+import aiohttp
+import asyncio
 import argparse
 import json
 from datetime import datetime
@@ -27,6 +28,7 @@ BRANDS_TO_SCRAPE = [
 ]
 
 BACKEND_URL = "http://localhost:8000"
+MAX_POLL_INTERVAL = 10  # seconds; cap for polling backoff while nothing changes
 
 
 class BackendScraper:
@@ -37,12 +39,14 @@ class BackendScraper:
         cleanup_delay: int = 5,
         max_timeout: int = 300,
         dry_run: bool = False,
+        concurrency: int = 4,
     ):
         self.backend_url = backend_url
         self.poll_interval = poll_interval
         self.cleanup_delay = cleanup_delay
         self.max_timeout = max_timeout
         self.dry_run = dry_run
+        self.concurrency = concurrency
         
         self.stats = {
             "total": 0,
@@ -52,10 +56,16 @@ class BackendScraper:
             "start_time": datetime.now(),
         }
 
-    def initiate_search(self, brand_name: str, website: str, sources: List[str]) -> str | None:
+    async def initiate_search(
+        self,
+        session: aiohttp.ClientSession,
+        brand_name: str,
+        website: str,
+        sources: List[str],
+    ) -> str | None:
         """Initiate a search for a brand."""
         try:
-            response = requests.post(
+            async with session.post(
                 f"{self.backend_url}/search",
                 json={
                     "query": brand_name,
@@ -63,32 +73,126 @@ class BackendScraper:
                     "auto_save": True,
                     "website_url": website,
                 },
-                headers={"Content-Type": "application/json"},
-            )
-
-            if response.status_code == 202:
-                data = response.json()
-                search_id = data.get("search_id")
-                print(f"  ✓ Search initiated: search_id={search_id}")
-                return search_id
-            else:
-                print(f"  ✗ Failed to initiate search: {response.status_code}")
-                return None
+            ) as response:
+                if response.status == 202:
+                    data = await response.json()
+                    search_id = data.get("search_id")
+                    print(f"  ✓ [{brand_name}] Search initiated: search_id={search_id}")
+                    return search_id
+                else:
+                    print(f"  ✗ [{brand_name}] Failed to initiate search: {response.status}")
+                    return None
         except Exception as e:
-            print(f"  ✗ Error initiating search: {e}")
+            print(f"  ✗ [{brand_name}] Error initiating search: {e}")
             return None
 
-    def poll_search_status(self, search_id: str, sources: List[str]) -> Dict[str, Any] | None:
-        """Poll search status until completion."""
+    @staticmethod
+    def print_progress(
+        brand_name: str, completed: int, total: int, source_progress: Dict[str, str]
+    ) -> None:
+        """Print per-source progress for a brand."""
+        print(f"  [{brand_name}] Progress: {completed}/{total} sources complete")
+        for source, src_status in source_progress.items():
+            if src_status == "completed":
+                icon = "✓"
+            elif src_status == "failed" or src_status == "error":
+                icon = "✗"
+            else:
+                icon = "⏳"
+            print(f"    {icon} {source}: {src_status}")
+
+    async def stream_search_status(
+        self,
+        session: aiohttp.ClientSession,
+        brand_name: str,
+        search_id: str,
+        sources: List[str],
+    ) -> Dict[str, Any] | None:
+        """
+        Follow the search's server-sent event stream until it finishes.
+
+        Raises aiohttp.ClientError / ValueError if the stream is unavailable or
+        drops before a terminal event, so the caller can fall back to polling.
+        """
+        async with session.get(
+            f"{self.backend_url}/search/{search_id}/stream",
+            params={"interval": str(self.poll_interval)},
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=self.max_timeout),
+        ) as response:
+            if response.status != 200:
+                raise aiohttp.ClientResponseError(
+                    response.request_info, response.history, status=response.status
+                )
+
+            async for raw_line in response.content:
+                line = raw_line.decode("utf-8").strip()
+                if not line.startswith("data:"):
+                    continue
+
+                data = json.loads(line[len("data:"):])
+                status = data.get("status")
+
+                if status == "processing":
+                    progress = data.get("progress", {})
+                    self.print_progress(
+                        brand_name,
+                        progress.get("completed", 0),
+                        progress.get("total", len(sources)),
+                        progress.get("sources", {}),
+                    )
+                elif status == "completed":
+                    stats = data.get("stats", {})
+                    total_results = stats.get("total_results", 0)
+                    avg_score = stats.get("average_score", 0)
+                    print(
+                        f"  ✅ [{brand_name}] Completed: {total_results} results, avg score: {avg_score:.2f}"
+                    )
+                    return data
+                elif status == "failed":
+                    error = data.get("error", "Unknown error")
+                    print(f"  ❌ [{brand_name}] Search failed: {error}")
+                    return None
+
+        raise ValueError("stream closed before the search finished")
+
+    async def wait_for_search(
+        self,
+        session: aiohttp.ClientSession,
+        brand_name: str,
+        search_id: str,
+        sources: List[str],
+    ) -> Dict[str, Any] | None:
+        """Wait for a search via the event stream, falling back to polling."""
+        try:
+            return await self.stream_search_status(session, brand_name, search_id, sources)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            print(f"  ⚠️  [{brand_name}] Event stream unavailable ({e}), polling instead")
+            return await self.poll_search_status(session, brand_name, search_id, sources)
+
+    async def poll_search_status(
+        self,
+        session: aiohttp.ClientSession,
+        brand_name: str,
+        search_id: str,
+        sources: List[str],
+    ) -> Dict[str, Any] | None:
+        """
+        Poll search status until completion.
+
+        The interval starts at poll_interval and backs off 1.5x (capped at
+        MAX_POLL_INTERVAL) while progress is unchanged, resetting on any change.
+        """
         prev_completed = 0
-        last_status_str = ""
+        last_source_progress: Dict[str, str] = {}
+        interval = self.poll_interval
 
         while True:
             try:
-                response = requests.get(f"{self.backend_url}/search/{search_id}")
+                async with session.get(f"{self.backend_url}/search/{search_id}") as response:
+                    status_code = response.status
+                    data = await response.json() if status_code == 200 else None
 
-                if response.status_code == 200:
-                    data = response.json()
+                if status_code == 200:
                     status = data.get("status")
 
                     if status == "processing":
@@ -99,21 +203,16 @@ class BackendScraper:
 
                         # Check if any source is still active or pending
                         active_sources = [s for s, src_status in source_progress.items()
-                                        if src_status in ["active", "pending"]]
+                                        if src_status in ["active", "pending", "processing"]]
 
                         # Only print if progress changed
-                        if completed != prev_completed or str(source_progress) != last_status_str:
-                            print(f"  Progress: {completed}/{total} sources complete")
-                            for source, src_status in source_progress.items():
-                                if src_status == "completed":
-                                    icon = "✓"
-                                elif src_status == "failed" or src_status == "error":
-                                    icon = "✗"
-                                else:
-                                    icon = "⏳"
-                                print(f"    {icon} {source}: {src_status}")
+                        if completed != prev_completed or source_progress != last_source_progress:
+                            self.print_progress(brand_name, completed, total, source_progress)
                             prev_completed = completed
-                            last_status_str = str(source_progress)
+                            last_source_progress = source_progress
+                            interval = self.poll_interval
+                        else:
+                            interval = min(interval * 1.5, MAX_POLL_INTERVAL)
 
                         # If no sources are still active/pending, all are done
                         if not active_sources:
@@ -121,18 +220,18 @@ class BackendScraper:
                             total_results = stats.get("total_results", 0)
                             avg_score = stats.get("average_score", 0)
                             print(
-                                f"  ✅ Completed: {total_results} results, avg score: {avg_score:.2f}"
+                                f"  ✅ [{brand_name}] Completed: {total_results} results, avg score: {avg_score:.2f}"
                             )
                             return data
 
-                        time.sleep(self.poll_interval)
+                        await asyncio.sleep(interval)
 
                     elif status == "completed":
                         # Backend says completed, verify all sources are terminal
                         progress = data.get("progress", {})
                         source_progress = progress.get("sources", {})
                         active_sources = [s for s, src_status in source_progress.items()
-                                        if src_status in ["active", "pending"]]
+                                        if src_status in ["active", "pending", "processing"]]
 
                         if not active_sources:
                             # All truly done
@@ -140,56 +239,79 @@ class BackendScraper:
                             total_results = stats.get("total_results", 0)
                             avg_score = stats.get("average_score", 0)
                             print(
-                                f"  ✅ Completed: {total_results} results, avg score: {avg_score:.2f}"
+                                f"  ✅ [{brand_name}] Completed: {total_results} results, avg score: {avg_score:.2f}"
                             )
                             return data
                         else:
                             # Some still active, keep polling
-                            time.sleep(self.poll_interval)
+                            await asyncio.sleep(interval)
 
                     elif status == "failed":
                         error = data.get("error", "Unknown error")
-                        print(f"  ❌ Search failed: {error}")
+                        print(f"  ❌ [{brand_name}] Search failed: {error}")
                         return None
 
                 else:
-                    print(f"  ✗ Error checking status: {response.status_code}")
+                    print(f"  ✗ [{brand_name}] Error checking status: {status_code}")
                     return None
 
-            except KeyboardInterrupt:
-                print("\n  ✗ Polling interrupted by user")
-                return None
+            except asyncio.CancelledError:
+                print(f"\n  ✗ [{brand_name}] Polling interrupted by user")
+                raise
             except Exception as e:
-                print(f"  ✗ Error polling status: {e}")
+                print(f"  ✗ [{brand_name}] Error polling status: {e}")
                 return None
 
-    def scrape_brand(self, brand: Dict[str, Any]) -> bool:
+    async def scrape_brand(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        brand: Dict[str, Any],
+        index: int,
+        total: int,
+    ) -> bool:
         """Scrape a single brand."""
         brand_name = brand.get("name")
         website = brand.get("website")
         sources = brand.get("sources", [])
 
-        print(f"\n[{self.stats['total'] + 1}/{len(BRANDS_TO_SCRAPE)}] Scraping {brand_name}...")
-
-        if self.dry_run:
-            print(f"  [DRY RUN] Would scrape {len(sources)} sources: {', '.join(sources)}")
-            return True
-
-        # Initiate search
-        search_id = self.initiate_search(brand_name, website, sources)
-        if not search_id:
-            return False
-
-        # Poll until completion
-        result = self.poll_search_status(search_id, sources)
-        if result:
-            stats = result.get("stats", {})
-            self.stats["total_results"] += stats.get("total_results", 0)
-            return True
+        # Stagger start times so brands are still initiated cleanup_delay seconds apart
+        if index > 0 and not self.dry_run:
+            delay = index * self.cleanup_delay
+            print(f"  [{brand_name}] Starting in {delay}s...")
+            await asyncio.sleep(delay)
 
-        return False
+        async with semaphore:
+            print(f"\n[{index + 1}/{total}] Scraping {brand_name}...")
 
-    def run(self, brands: List[Dict[str, Any]] | None = None) -> None:
+            if self.dry_run:
+                print(f"  [DRY RUN] Would scrape {len(sources)} sources: {', '.join(sources)}")
+                success = True
+            else:
+                success = False
+
+                # Initiate search
+                search_id = await self.initiate_search(session, brand_name, website, sources)
+
+                # Follow the search until completion
+                result = (
+                    await self.wait_for_search(session, brand_name, search_id, sources)
+                    if search_id else None
+                )
+                if result:
+                    stats = result.get("stats", {})
+                    self.stats["total_results"] += stats.get("total_results", 0)
+                    success = True
+
+        self.stats["total"] += 1
+        if success:
+            self.stats["successful"] += 1
+        else:
+            self.stats["failed"] += 1
+
+        return success
+
+    async def run(self, brands: List[Dict[str, Any]] | None = None) -> None:
         """Run the batch scraper."""
         if brands is None:
             brands = BRANDS_TO_SCRAPE
@@ -201,27 +323,27 @@ class BackendScraper:
         print(f"Dry Run: {self.dry_run}")
         print(f"Poll Interval: {self.poll_interval}s")
         print(f"Cleanup Delay: {self.cleanup_delay}s")
+        print(f"Concurrency: {self.concurrency}")
         print(f"\nLoading {len(brands)} brands...\n")
 
-        for i, brand in enumerate(brands):
-            self.stats["total"] = i + 1
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+        connector = aiohttp.TCPConnector(limit=32)
 
-            success = self.scrape_brand(brand)
+        # Completed events carry every result on one line, so allow large reads
+        async with aiohttp.ClientSession(connector=connector, read_bufsize=2**20) as session:
+            await asyncio.gather(*(
+                self.scrape_brand(session, semaphore, brand, i, len(brands))
+                for i, brand in enumerate(brands)
+            ))
 
-            if success:
-                self.stats["successful"] += 1
-            else:
-                self.stats["failed"] += 1
+            self.print_summary()
 
-            # Wait before next brand (except for the last one)
-            if i < len(brands) - 1 and not self.dry_run:
-                print(f"  Waiting {self.cleanup_delay} seconds before next...", end="")
-                for _ in range(self.cleanup_delay):
-                    print(".", end="", flush=True)
-                    time.sleep(1)
-                print()
+            # Verify brands in database
+            if not self.dry_run:
+                await self.verify_brands_in_database(session)
 
-        # Print summary
+    def print_summary(self) -> None:
+        """Print the run summary."""
         elapsed = (datetime.now() - self.stats["start_time"]).total_seconds()
         minutes, seconds = divmod(int(elapsed), 60)
 
@@ -235,21 +357,20 @@ class BackendScraper:
         print(f"Time Elapsed: {minutes}m {seconds}s")
         print("=" * 60 + "\n")
 
-        # Verify brands in database
-        if not self.dry_run:
-            self.verify_brands_in_database()
-
-    def verify_brands_in_database(self) -> None:
+    async def verify_brands_in_database(self, session: aiohttp.ClientSession) -> None:
         """Verify that scraped brands appear in the database."""
         print("Verifying brands in database...")
         try:
-            response = requests.get(f"{self.backend_url}/api/brands")
-            if response.status_code == 200:
-                data = response.json()
-                brands_in_db = [b.get("name") for b in data.get("brands", [])]
+            async with session.get(f"{self.backend_url}/api/brands") as response:
+                status_code = response.status
+                data = await response.json() if status_code == 200 else None
+
+            if status_code == 200:
+                brands_in_db = {b.get("name") for b in data.get("brands", [])}
                 scraped_brands = [b.get("name") for b in BRANDS_TO_SCRAPE]
 
-                found = [b for b in scraped_brands if b in brands_in_db]
+                found = brands_in_db.intersection(scraped_brands)
+                # Keep scrape order for the missing list
                 missing = [b for b in scraped_brands if b not in brands_in_db]
 
                 print(f"\nDatabase has {len(brands_in_db)} total brands")
@@ -259,7 +380,7 @@ class BackendScraper:
                     for b in missing:
                         print(f"  - {b}")
             else:
-                print(f"Failed to verify: {response.status_code}")
+                print(f"Failed to verify: {status_code}")
         except Exception as e:
             print(f"Error verifying brands: {e}")
 
@@ -291,6 +412,12 @@ def main():
         default=300,
         help="Max seconds to wait for a single brand scrape (default: 300)",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Max brands scraped at the same time (default: 4)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -329,10 +456,11 @@ def main():
         cleanup_delay=args.cleanup_delay,
         max_timeout=args.timeout,
         dry_run=args.dry_run,
+        concurrency=args.concurrency,
     )
 
     try:
-        scraper.run(brands)
+        asyncio.run(scraper.run(brands))
     except KeyboardInterrupt:
         print("\n\n⚠️  Scraper interrupted by user")
         print(f"Progress: {scraper.stats['successful']}/{scraper.stats['total']} successful")
@@ -6,8 +6,12 @@ Responses from the API typically include node references in the format:
 @node (1-1352)
 """
 
+import atexit
 import os
-import requests
+from threading import Lock
+import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from typing import Dict, Any, Optional
 
@@ -17,6 +21,27 @@ load_dotenv()
 BROWSER_AGENT_API_KEY = os.getenv("BROWSER_CASH_AGENT_API_KEY")
 BROWSER_CASH_API_BASE = os.getenv("BROWSER_CASH_API_BASE")
 
+# Fail at startup rather than with a confusing 401 / bad URL on the first call
+if not BROWSER_AGENT_API_KEY or not BROWSER_CASH_API_BASE:
+    raise RuntimeError(
+        "BROWSER_CASH_AGENT_API_KEY and BROWSER_CASH_API_BASE must be set (see .env)"
+    )
+
+# One pooled HTTP/2 client for every call: per-source creates and status polls
+# multiplex over warm connections, so TLS handshakes are paid once per connection
+_client = httpx.Client(
+    base_url=BROWSER_CASH_API_BASE,
+    headers={"Authorization": f"Bearer {BROWSER_AGENT_API_KEY}"},
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+)
+atexit.register(_client.close)
+
+# task_id -> (validator headers, last body) for conditional get_task requests
+_task_cache: "TTLCache[str, tuple]" = TTLCache(maxsize=1024, ttl=300)
+_task_cache_lock = Lock()
+
 
 def create_task(
     agent: str = "gemini",
@@ -39,14 +64,10 @@ def create_task(
         - Other response fields that may include node references like @node (1-1352)
     
     Raises:
-        requests.RequestException: If the API request fails
+        httpx.HTTPError: If the API request fails
     """
-    resp = requests.post(
-        BROWSER_CASH_API_BASE + "/v1/task/create",
-        headers={
-            "Authorization": f"Bearer {BROWSER_AGENT_API_KEY}",
-            "content-type": "application/json",
-        },
+    resp = _client.post(
+        "/v1/task/create",
         json={
             "agent": agent,
             "prompt": prompt,
@@ -55,13 +76,16 @@ def create_task(
         },
     )
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
 
 
 def get_task(task_id: str) -> Dict[str, Any]:
     """
     Retrieve the status and results of a task.
     
+    Sends the task's last ETag / Last-Modified as a conditional request when
+    the server provided one, and reuses the cached body on 304 Not Modified.
+    
     Args:
         task_id: The unique task identifier
     
@@ -72,14 +96,33 @@ def get_task(task_id: str) -> Dict[str, Any]:
         - Other task metadata
     
     Raises:
-        requests.RequestException: If the API request fails
+        httpx.HTTPError: If the API request fails
     """
-    resp = requests.get(
-        f"{BROWSER_CASH_API_BASE}/v1/task/{task_id}",
-        headers={"Authorization": f"Bearer {BROWSER_AGENT_API_KEY}"},
+    with _task_cache_lock:
+        cached = _task_cache.get(task_id)
+    
+    # Revalidate instead of re-downloading an unchanged task body
+    resp = _client.get(
+        f"/v1/task/{task_id}",
+        headers=cached[0] if cached is not None else None,
     )
+    
+    if resp.status_code == 304 and cached is not None:
+        return cached[1]
+    
     resp.raise_for_status()
-    return resp.json()
+    data = orjson.loads(resp.content)
+    
+    validators = {}
+    if "ETag" in resp.headers:
+        validators["If-None-Match"] = resp.headers["ETag"]
+    if "Last-Modified" in resp.headers:
+        validators["If-Modified-Since"] = resp.headers["Last-Modified"]
+    if validators:
+        with _task_cache_lock:
+            _task_cache[task_id] = (validators, data)
+    
+    return data
 
 
 def list_tasks(page_size: int = 20, page: int = 1) -> Dict[str, Any]:
@@ -97,13 +140,12 @@ def list_tasks(page_size: int = 20, page: int = 1) -> Dict[str, Any]:
         - Results with node references like @node (1-1352)
     
     Raises:
-        requests.RequestException: If the API request fails
+        httpx.HTTPError: If the API request fails
     """
-    resp = requests.get(
-        f"{BROWSER_CASH_API_BASE}/v1/task/list",
-        headers={"Authorization": f"Bearer {BROWSER_AGENT_API_KEY}"},
+    resp = _client.get(
+        "/v1/task/list",
         params={"pageSize": page_size, "page": page},
     )
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
 
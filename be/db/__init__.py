@@ -1,5 +1,6 @@
 from .database import (
     save_brand_data,
+    bulk_save_brand_data,
     get_brand_data,
     get_brand_data_range,
     list_brands,
@@ -9,6 +10,7 @@ from .models import ReputationEntry
 
 __all__ = [
     'save_brand_data',
+    'bulk_save_brand_data',
     'get_brand_data',
     'get_brand_data_range',
     'list_brands',
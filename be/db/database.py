@@ -1,14 +1,159 @@
 import os
-import json
+import heapq
+import mmap
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
 from pathlib import Path
-from .models import ReputationEntry
+from threading import Lock, RLock
+
+import orjson
+
+from .models import ReputationEntry, is_mmddyyyy
 
 
 BASE_DIR = Path(__file__).parent.parent
 BRANDS_DIR = BASE_DIR / "brands"
 
+# File naming and date formats, defined once and reused by every query
+DATA_FILE_GLOB = "day_*_data.json"
+FILE_DATE_FORMAT = "%Y-%m-%d"    # filename / query parameter dates
+ENTRY_DATE_FORMAT = "%m-%d-%Y"   # entry 'date' field (posting date)
+STATS_FILE_NAME = "_stats.json"  # running per-brand aggregate, see _update_stats_incremental
+INDEX_FILE_NAME = "_files.json"  # per-brand file date -> [data file names], see _index_add_file
+SECONDS_PER_DAY = 86400
+
+
+# Parsed data files keyed by path -> (mtime_ns, size, entries). Files are
+# immutable once written, so a matching stat means the parse can be reused.
+_FILE_CACHE: "OrderedDict[str, Tuple[int, int, List[Dict[str, Any]]]]" = OrderedDict()
+_FILE_CACHE_MAX = 512
+# Per-date partial stats per data file, same keying as _FILE_CACHE
+_AGGREGATE_CACHE: "OrderedDict[str, Tuple[int, int, Dict[str, List[Any]]]]" = OrderedDict()
+_file_cache_lock = Lock()
+
+# Shared pool for overlapping file reads; open/read and orjson parsing release the GIL
+_READ_POOL_WORKERS = 16
+_read_pool = ThreadPoolExecutor(max_workers=_READ_POOL_WORKERS, thread_name_prefix="clarity-read")
+
+
+def _cached_per_file(
+    cache: "OrderedDict[str, Tuple[int, int, Any]]",
+    file_path: Path,
+    compute: Callable[[Path], Any]
+) -> Any:
+    """
+    Return compute(file_path), reusing the cached value while mtime and size are unchanged.
+    
+    Cached values are shared; treat them as read-only.
+    """
+    key = str(file_path)
+    st = file_path.stat()
+    
+    with _file_cache_lock:
+        cached = cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            cache.move_to_end(key)
+            return cached[2]
+    
+    value = compute(file_path)
+    
+    with _file_cache_lock:
+        cache[key] = (st.st_mtime_ns, st.st_size, value)
+        cache.move_to_end(key)
+        while len(cache) > _FILE_CACHE_MAX:
+            cache.popitem(last=False)
+    
+    return value
+
+
+def _read_json(file_path: Path) -> List[Dict[str, Any]]:
+    """Parse a data file from disk."""
+    if file_path.stat().st_size == 0:
+        return []
+    
+    # orjson parses straight from the mapped pages, no read() copy or str decode
+    with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            return orjson.loads(view)
+
+
+def _load_json(file_path: Path) -> List[Dict[str, Any]]:
+    """
+    Load a data file, reusing the cached parse when mtime and size are unchanged.
+    
+    The returned list is shared with the cache; treat it as read-only.
+    """
+    return _cached_per_file(_FILE_CACHE, file_path, _read_json)
+
+
+def _load_many(paths: List[Path], loader: Callable[[Path], Any] = _load_json) -> List[Any]:
+    """
+    Apply a cached file loader to several paths concurrently on the read pool.
+    
+    Args:
+        paths: Files to load
+        loader: _load_json or _load_file_aggregate
+    
+    Returns:
+        Loaded values in the same order as paths
+    """
+    if len(paths) <= 2:
+        return [loader(path) for path in paths]
+    return list(_read_pool.map(loader, paths))
+
+
+def _aggregate_file(file_path: Path) -> Dict[str, List[Any]]:
+    """
+    Fold a data file into per-date partial stats.
+    
+    Returns:
+        Dict of entry date -> [count, score_sum, {source: [count, score_sum]}, latest_scraped_at]
+    """
+    buckets: Dict[str, List[Any]] = {}
+    
+    for entry in _load_json(file_path):
+        bucket = buckets.get(entry['date'])
+        if bucket is None:
+            bucket = buckets[entry['date']] = [0, 0.0, {}, None]
+        
+        score = entry['reputation_score']
+        bucket[0] += 1
+        bucket[1] += score
+        
+        source_totals = bucket[2].get(entry['source_type'])
+        if source_totals is None:
+            source_totals = bucket[2][entry['source_type']] = [0, 0.0]
+        source_totals[0] += 1
+        source_totals[1] += score
+        
+        scraped_at = entry['scraped_at']
+        if bucket[3] is None or scraped_at > bucket[3]:
+            bucket[3] = scraped_at
+    
+    return buckets
+
+
+def _load_file_aggregate(file_path: Path) -> Dict[str, List[Any]]:
+    """Per-date partial stats for a data file, cached alongside the parse."""
+    return _cached_per_file(_AGGREGATE_CACHE, file_path, _aggregate_file)
+
+
+@lru_cache(maxsize=4096)
+def _entry_day(date_str: str) -> int:
+    """
+    Day ordinal of an entry date (MM-DD-YYYY), for plain int range checks.
+    
+    Memoized, since entries share few distinct dates. Canonical dates are
+    sliced directly; anything else (e.g. unpadded) goes through strptime.
+    """
+    if is_mmddyyyy(date_str):
+        return datetime(int(date_str[6:]), int(date_str[:2]), int(date_str[3:5])).toordinal()
+    return datetime.strptime(date_str, ENTRY_DATE_FORMAT).toordinal()
+
 
 def _ensure_brand_dir(brand_name: str) -> Path:
     """Ensure brand directory exists."""
@@ -25,10 +170,91 @@ def _get_data_file_path(brand_name: str, date: str, epoch_time: int = None) -> P
     return brand_dir / f"day_{date}_data.json"
 
 
+# Serializes read-modify-write of the per-brand _files.json / _stats.json
+_meta_lock = RLock()
+
+
+def _write_json_atomic(path: Path, obj: Any, option: Optional[int] = None) -> None:
+    """Write JSON via a temp file and os.replace so readers never see a partial file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(orjson.dumps(obj, option=option))
+    os.replace(tmp_path, path)
+
+
+def _rebuild_file_index(brand_dir: Path) -> Dict[str, List[str]]:
+    """Scan a brand directory once and write its _files.json."""
+    with _meta_lock:
+        index: Dict[str, List[str]] = {}
+        for file_path in sorted(brand_dir.glob(DATA_FILE_GLOB)):
+            # Filename format: day_2025-11-15_1763263869_data.json
+            index.setdefault(file_path.name.split('_')[1], []).append(file_path.name)
+        
+        _write_json_atomic(brand_dir / INDEX_FILE_NAME, index)
+    
+    return index
+
+
+def _load_file_index(brand_dir: Path) -> Dict[str, List[str]]:
+    """
+    Load a brand's file index (file date -> data file names, oldest first).
+    
+    Cached like data files; rebuilt from a directory scan if missing. Treat as read-only.
+    """
+    try:
+        return _cached_per_file(_FILE_CACHE, brand_dir / INDEX_FILE_NAME, _read_json)
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return _rebuild_file_index(brand_dir)
+
+
+def _index_add_file(file_path: Path, date_str: str) -> None:
+    """Record a newly written data file in its brand's _files.json."""
+    brand_dir = file_path.parent
+    index_path = brand_dir / INDEX_FILE_NAME
+    
+    with _meta_lock:
+        if not index_path.exists():
+            _rebuild_file_index(brand_dir)
+            return
+        
+        # Fresh parse: the cached index is shared and must not be mutated
+        index = orjson.loads(index_path.read_bytes())
+        names = index.setdefault(date_str, [])
+        if file_path.name not in names:
+            names.append(file_path.name)
+        
+        _write_json_atomic(index_path, index)
+
+
+def _list_data_files(brand_dir: Path, since: Optional[datetime] = None) -> List[Path]:
+    """
+    List a brand's data files from its index, oldest first.
+    
+    Args:
+        brand_dir: Brand directory
+        since: Skip files scraped more than a day before this date; entries are
+            posted on or before the day they are scraped, so those files cannot
+            hold anything newer (the day of slack covers timezone skew)
+    
+    Returns:
+        Data file paths ordered by file date, then save order
+    """
+    index = _load_file_index(brand_dir)
+    dates = sorted(index)
+    
+    if since is not None:
+        cutoff = (since - timedelta(days=1)).strftime(FILE_DATE_FORMAT)
+        dates = [date for date in dates if date >= cutoff]
+    
+    return [brand_dir / name for date in dates for name in index[date]]
+
+
 def save_brand_data(brand_name: str, entries: List[ReputationEntry]) -> bool:
     """
     Save brand reputation data for a specific date with epoch timestamp.
     
+    Entries are serialized straight from the dataclasses (orjson handles them
+    natively), so no intermediate dict is built per entry.
+    
     Args:
         brand_name: Name of the brand
         entries: List of ReputationEntry objects
@@ -39,31 +265,78 @@ def save_brand_data(brand_name: str, entries: List[ReputationEntry]) -> bool:
     if not entries:
         return False
     
-    now = datetime.now()
-    date_str = now.strftime("%Y-%m-%d")
-    epoch_time = int(now.timestamp())
+    file_path, date_str = _write_data_file(brand_name, entries)
     
-    # Use epoch time in filename to avoid overwriting within the same day
-    file_path = _get_data_file_path(brand_name, date_str, epoch_time)
+    _index_add_file(file_path, date_str)
+    _update_stats_incremental(file_path.parent, (
+        (e.source_type, e.reputation_score, e.scraped_at, e.date) for e in entries
+    ))
     
-    new_entries = [entry.to_dict() for entry in entries]
+    return True
+
+
+def bulk_save_brand_data(brand_name: str, entries: List[Dict[str, Any]]) -> bool:
+    """
+    Save already-validated entry dicts in a single write.
     
-    # Create new file with epoch time (no more appending to existing)
-    with open(file_path, 'w') as f:
-        json.dump(new_entries, f, indent=2)
+    Args:
+        brand_name: Name of the brand
+        entries: List of entry dicts (see ReputationEntry.validate_dict)
     
-    print(f"[DB] Saved {len(new_entries)} entries to {file_path.name}")
+    Returns:
+        True if successful
+    """
+    if not entries:
+        return False
+    
+    file_path, date_str = _write_data_file(brand_name, entries)
+    
+    _index_add_file(file_path, date_str)
+    _update_stats_incremental(file_path.parent, (
+        (e['source_type'], e['reputation_score'], e['scraped_at'], e['date']) for e in entries
+    ))
     
     return True
 
 
-def get_brand_data(brand_name: str, date: str) -> List[Dict[str, Any]]:
+def _write_data_file(brand_name: str, entries: List[Any]) -> Tuple[Path, str]:
+    """
+    Write a batch of entries (dicts or ReputationEntry) to a new data file.
+    
+    Returns:
+        (path of the new file, its YYYY-MM-DD date)
+    """
+    now = datetime.now()
+    date_str = now.strftime(FILE_DATE_FORMAT)
+    epoch_time = int(now.timestamp())
+    
+    # Use epoch time in filename to avoid overwriting within the same day; claim
+    # the name exclusively so two saves in the same second get distinct files
+    while True:
+        file_path = _get_data_file_path(brand_name, date_str, epoch_time)
+        try:
+            os.close(os.open(file_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            epoch_time += 1
+    
+    # Create new file with epoch time (no more appending to existing); serialized
+    # in one go and renamed into place so concurrent reads never see a partial file
+    _write_json_atomic(file_path, entries, option=orjson.OPT_INDENT_2)
+    
+    print(f"[DB] Saved {len(entries)} entries to {file_path.name}")
+    
+    return file_path, date_str
+
+
+def get_brand_data(brand_name: str, date: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Get brand reputation data for a specific date (all files for that day).
     
     Args:
         brand_name: Name of the brand
         date: Date in YYYY-MM-DD format
+        limit: Maximum number of entries to return (stops reading files once reached)
     
     Returns:
         List of reputation entries from all files for that date
@@ -73,60 +346,89 @@ def get_brand_data(brand_name: str, date: str) -> List[Dict[str, Any]]:
     if not brand_dir.exists():
         return []
     
-    # Find all files for this date (with any epoch time)
-    pattern = f"day_{date}_*_data.json"
-    data_files = brand_dir.glob(pattern)
-    
+    # All files for this date (with any epoch time), straight from the index
     all_data = []
-    for file_path in data_files:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            all_data.extend(data)
+    for name in _load_file_index(brand_dir).get(date, ()):
+        all_data.extend(_load_json(brand_dir / name))
+        
+        if limit is not None and len(all_data) >= limit:
+            del all_data[limit:]
+            break
     
     return all_data
 
 
-def get_brand_data_range(
+def iter_brand_data_range(
     brand_name: str, 
     start_date: str, 
     end_date: str
-) -> List[Dict[str, Any]]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Get brand reputation data for a date range.
+    Lazily yield brand reputation entries within a date range.
+    
+    Files are read in small concurrent batches as the caller consumes entries.
     
     Args:
         brand_name: Name of the brand
         start_date: Start date in YYYY-MM-DD format
         end_date: End date in YYYY-MM-DD format
     
-    Returns:
-        List of reputation entries within the date range
+    Yields:
+        Reputation entries within the date range
     """
     brand_dir = BRANDS_DIR / brand_name
     
     if not brand_dir.exists():
-        return []
+        return
     
     # Parse date range
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    
-    # Load all data files for this brand
-    all_data = []
-    data_files = list(brand_dir.glob("day_*_data.json"))
-    
-    for file_path in data_files:
-        with open(file_path, 'r') as f:
-            all_data.extend(json.load(f))
+    start = datetime.strptime(start_date, FILE_DATE_FORMAT)
+    end = datetime.strptime(end_date, FILE_DATE_FORMAT)
+    
+    start_day = start.toordinal()
+    end_day = end.toordinal()
+    
+    data_files = _list_data_files(brand_dir, since=start)
+    
+    # Load a pool-sized batch of files at a time, so a limited read stops
+    # after the batch that satisfies it
+    for i in range(0, len(data_files), _READ_POOL_WORKERS):
+        for data in _load_many(data_files[i:i + _READ_POOL_WORKERS]):
+            # Filter by entry date (entries have date in MM-DD-YYYY format)
+            for entry in data:
+                if start_day <= _entry_day(entry['date']) <= end_day:
+                    yield entry
+
+
+def get_brand_data_range(
+    brand_name: str, 
+    start_date: str, 
+    end_date: str,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Get brand reputation data for a date range.
     
-    # Filter by entry date (entries have date in MM-DD-YYYY format)
-    filtered_data = []
-    for entry in all_data:
-        entry_date = datetime.strptime(entry['date'], "%m-%d-%Y")
-        if start <= entry_date <= end:
-            filtered_data.append(entry)
+    Args:
+        brand_name: Name of the brand
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        limit: Maximum number of entries to return (stops reading files once reached)
     
-    return filtered_data
+    Returns:
+        List of reputation entries within the date range
+    """
+    return list(islice(iter_brand_data_range(brand_name, start_date, end_date), limit))
+
+
+def _file_epoch(file_path: Path) -> Optional[int]:
+    """Epoch time encoded in a data filename, or None for legacy names without one."""
+    # Filename format: day_2025-11-15_1763263869_data.json
+    parts = file_path.stem.split('_')
+    try:
+        return int(parts[2])
+    except (ValueError, IndexError):
+        return None
 
 
 def get_brand_last_updated(brand_name: str) -> Optional[str]:
@@ -145,23 +447,13 @@ def get_brand_last_updated(brand_name: str) -> Optional[str]:
         return None
     
     # Get all data files
-    data_files = list(brand_dir.glob("day_*_data.json"))
+    data_files = _list_data_files(brand_dir)
     
     if not data_files:
         return None
     
     # Extract epoch timestamps from filenames and find the latest
-    latest_epoch = 0
-    for file_path in data_files:
-        # Filename format: day_2025-11-15_1763263869_data.json
-        parts = file_path.stem.split('_')
-        if len(parts) >= 3:
-            try:
-                epoch = int(parts[2])
-                if epoch > latest_epoch:
-                    latest_epoch = epoch
-            except (ValueError, IndexError):
-                continue
+    latest_epoch = max((_file_epoch(file_path) or 0 for file_path in data_files), default=0)
     
     if latest_epoch == 0:
         return None
@@ -194,13 +486,20 @@ def list_brands() -> List[Dict[str, Any]]:
     return brands
 
 
-def get_latest_data(brand_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+def get_latest_data(
+    brand_name: str,
+    limit: int = 10,
+    offset: int = 0,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
     Get the most recent reputation entries for a brand.
     
     Args:
         brand_name: Name of the brand
         limit: Maximum number of entries to return
+        offset: Number of entries to skip
+        before: Optional scraped_at cursor; only entries scraped strictly before it are returned
     
     Returns:
         List of recent reputation entries
@@ -210,22 +509,157 @@ def get_latest_data(brand_name: str, limit: int = 10) -> List[Dict[str, Any]]:
     if not brand_dir.exists():
         return []
     
-    data_files = sorted(
-        brand_dir.glob("day_*_data.json"),
-        reverse=True
-    )
+    needed = offset + limit
+    if needed <= 0:
+        return []
     
-    all_data = []
-    for file_path in data_files:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            all_data.extend(data)
+    # Min-heap of the `needed` newest entries as (scraped_at, -seq, entry);
+    # -seq keeps ties in newest-file-first order without comparing dicts
+    heap: List[Tuple[str, int, Dict[str, Any]]] = []
+    seq = 0
+    
+    for file_path in reversed(_list_data_files(brand_dir)):
+        file_epoch = _file_epoch(file_path)
+        if len(heap) >= needed and file_epoch is not None:
+            # Entries are stamped before their file is written; a day of slack
+            # covers clock and timezone differences in entries saved via /save
+            newest_possible = datetime.fromtimestamp(file_epoch + SECONDS_PER_DAY).isoformat()
+            if heap[0][0] >= newest_possible:
+                break
         
-        if len(all_data) >= limit:
-            break
+        for entry in _load_json(file_path):
+            scraped_at = entry['scraped_at']
+            if before is not None and scraped_at >= before:
+                continue
+            
+            seq += 1
+            if len(heap) < needed:
+                heapq.heappush(heap, (scraped_at, -seq, entry))
+            elif scraped_at > heap[0][0]:
+                heapq.heapreplace(heap, (scraped_at, -seq, entry))
+    
+    heap.sort(reverse=True)
+    return [entry for _, _, entry in heap[offset:]]
+
+
+def _empty_stats() -> Dict[str, Any]:
+    """Raw stats for a brand with no entries (the _stats.json shape)."""
+    return {
+        "count": 0,
+        "sum_score": 0.0,
+        "by_source": {},  # source -> [count, score_sum]
+        "latest_scraped_at": None,
+        "latest_date": None
+    }
+
+
+def _merge_file_aggregates(
+    brand_dir: Path,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Merge cached per-file, per-date partials into raw stats, optionally limited to a date range."""
+    data_files = _list_data_files(brand_dir, since=start)
+    filter_dates = start is not None or end is not None
+    start_day = start.toordinal() if start is not None else datetime.min.toordinal()
+    end_day = end.toordinal() if end is not None else datetime.max.toordinal()
+    
+    stats = _empty_stats()
+    by_source_totals = stats["by_source"]
+    
+    for aggregate in _load_many(data_files, _load_file_aggregate):
+        for entry_date, (count, score_sum, sources, scraped_at) in aggregate.items():
+            if filter_dates and not start_day <= _entry_day(entry_date) <= end_day:
+                continue
+            
+            stats["count"] += count
+            stats["sum_score"] += score_sum
+            
+            for source, (source_count, source_sum) in sources.items():
+                source_totals = by_source_totals.get(source)
+                if source_totals is None:
+                    source_totals = by_source_totals[source] = [0, 0.0]
+                source_totals[0] += source_count
+                source_totals[1] += source_sum
+            
+            if stats["latest_scraped_at"] is None or scraped_at > stats["latest_scraped_at"]:
+                stats["latest_scraped_at"] = scraped_at
+                stats["latest_date"] = entry_date
+    
+    return stats
+
+
+def rebuild_brand_stats(brand_name: str) -> Dict[str, Any]:
+    """
+    Regenerate a brand's _stats.json from its data files.
     
-    all_data.sort(key=lambda x: x['scraped_at'], reverse=True)
-    return all_data[:limit]
+    Args:
+        brand_name: Name of the brand
+    
+    Returns:
+        The rebuilt raw stats
+    """
+    brand_dir = BRANDS_DIR / brand_name
+    
+    with _meta_lock:
+        stats = _merge_file_aggregates(brand_dir)
+        _write_json_atomic(brand_dir / STATS_FILE_NAME, stats)
+    
+    return stats
+
+
+def _update_stats_incremental(
+    brand_dir: Path,
+    new_entries: Iterable[Tuple[str, float, str, str]]
+) -> None:
+    """
+    Fold a freshly saved batch into the brand's _stats.json.
+    
+    Args:
+        brand_dir: Brand directory the batch was written to
+        new_entries: (source_type, reputation_score, scraped_at, date) of each saved entry
+    """
+    stats_path = brand_dir / STATS_FILE_NAME
+    
+    with _meta_lock:
+        if not stats_path.exists():
+            # First save, or stats were dropped: the new file is already on disk
+            _write_json_atomic(brand_dir / STATS_FILE_NAME, _merge_file_aggregates(brand_dir))
+            return
+        
+        try:
+            stats = orjson.loads(stats_path.read_bytes())
+            by_source = stats["by_source"]
+            
+            for source_type, score, scraped_at, date in new_entries:
+                stats["count"] += 1
+                stats["sum_score"] += score
+                
+                source_totals = by_source.get(source_type)
+                if source_totals is None:
+                    source_totals = by_source[source_type] = [0, 0.0]
+                source_totals[0] += 1
+                source_totals[1] += score
+                
+                if stats["latest_scraped_at"] is None or scraped_at > stats["latest_scraped_at"]:
+                    stats["latest_scraped_at"] = scraped_at
+                    stats["latest_date"] = date
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            # Corrupt or truncated stats (as in _read_stats): the batch is already
+            # saved, so rebuild from the data files instead of failing the save
+            print(f"[DB] Unreadable {STATS_FILE_NAME} for {brand_dir.name}, rebuilding")
+            _write_json_atomic(brand_dir / STATS_FILE_NAME, _merge_file_aggregates(brand_dir))
+            return
+        
+        _write_json_atomic(brand_dir / STATS_FILE_NAME, stats)
+
+
+def _read_stats(brand_name: str) -> Dict[str, Any]:
+    """Load a brand's _stats.json, rebuilding it from data files if missing or unreadable."""
+    try:
+        return orjson.loads((BRANDS_DIR / brand_name / STATS_FILE_NAME).read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return rebuild_brand_stats(brand_name)
 
 
 def get_brand_stats(brand_name: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Dict[str, Any]:
@@ -250,27 +684,18 @@ def get_brand_stats(brand_name: str, start_date: Optional[str] = None, end_date:
             "latest_date": None
         }
     
-    all_entries = []
-    data_files = list(brand_dir.glob("day_*_data.json"))
+    start = datetime.strptime(start_date, FILE_DATE_FORMAT) if start_date else None
+    end = datetime.strptime(end_date, FILE_DATE_FORMAT) if end_date else None
     
-    for file_path in data_files:
-        with open(file_path, 'r') as f:
-            all_entries.extend(json.load(f))
+    if start is None and end is None:
+        # Unfiltered: the running aggregate maintained on every save
+        stats = _read_stats(brand_name)
+    else:
+        stats = _merge_file_aggregates(brand_dir, start, end)
     
-    # Filter by date range if provided
-    if start_date or end_date:
-        filtered_entries = []
-        start = datetime.strptime(start_date, "%Y-%m-%d") if start_date else datetime.min
-        end = datetime.strptime(end_date, "%Y-%m-%d") if end_date else datetime.max
-        
-        for entry in all_entries:
-            entry_date = datetime.strptime(entry['date'], "%m-%d-%Y")
-            if start <= entry_date <= end:
-                filtered_entries.append(entry)
-        
-        all_entries = filtered_entries
+    total = stats["count"]
     
-    if not all_entries:
+    if not total:
         return {
             "total_entries": 0,
             "average_score": 0.0,
@@ -278,27 +703,35 @@ def get_brand_stats(brand_name: str, start_date: Optional[str] = None, end_date:
             "latest_date": None
         }
     
-    total = len(all_entries)
-    avg_score = sum(e['reputation_score'] for e in all_entries) / total
-    
-    by_source = {}
-    for entry in all_entries:
-        source = entry['source_type']
-        if source not in by_source:
-            by_source[source] = {"count": 0, "avg_score": 0.0, "scores": []}
-        by_source[source]["count"] += 1
-        by_source[source]["scores"].append(entry['reputation_score'])
-    
-    for source in by_source:
-        scores = by_source[source]["scores"]
-        by_source[source]["avg_score"] = sum(scores) / len(scores)
-        del by_source[source]["scores"]
-    
-    latest_entry = max(all_entries, key=lambda x: x['scraped_at'])
+    by_source = {
+        source: {"count": count, "avg_score": score_sum / count}
+        for source, (count, score_sum) in stats["by_source"].items()
+    }
     
     return {
         "total_entries": total,
-        "average_score": round(avg_score, 3),
+        "average_score": round(stats["sum_score"] / total, 3),
         "by_source": by_source,
-        "latest_date": latest_entry['date']
+        "latest_date": stats["latest_date"]
     }
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Brand data maintenance")
+    parser.add_argument("--rebuild", nargs="*", metavar="BRAND",
+                        help="Regenerate _files.json and _stats.json from data files (all brands if none given)")
+    args = parser.parse_args()
+    
+    if args.rebuild is not None:
+        brand_names = args.rebuild or [b["name"] for b in list_brands()]
+        for name in brand_names:
+            # Don't create index/stats files for a brand that was never saved
+            if not (BRANDS_DIR / name).is_dir():
+                print(f"[DB] Warning: no data directory for brand {name!r}, skipping")
+                continue
+            
+            _rebuild_file_index(BRANDS_DIR / name)
+            stats = rebuild_brand_stats(name)
+            print(f"[DB] Rebuilt stats for {name}: {stats['count']} entries")
@@ -1,9 +1,47 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, MISSING
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 
-@dataclass
+# The one list of source types; scraper and API validation import these
+_REVIEW_TYPES = ('trustpilot', 'yelp', 'google_reviews')
+_ARTICLE_TYPES = ('news', 'blog', 'forum', 'website')
+
+REVIEW_SOURCES = frozenset(_REVIEW_TYPES)
+ARTICLE_SOURCES = frozenset(_ARTICLE_TYPES)
+SCRAPE_SOURCES = REVIEW_SOURCES | ARTICLE_SOURCES  # sources Browser.cash can be asked to scrape
+
+# Saved entries may also be 'other' (e.g. added manually)
+_SOURCE_TYPES = _REVIEW_TYPES + _ARTICLE_TYPES + ('other',)
+_VALID_SOURCES = frozenset(_SOURCE_TYPES)
+
+
+def is_mmddyyyy(value: Any, prefix: bool = False) -> bool:
+    """
+    Check that a value is an MM-DD-YYYY shaped string of ASCII digits.
+    
+    Fixed-position slice checks instead of a regex match per entry.
+    
+    Args:
+        value: Value to check (non-strings are rejected)
+        prefix: Only require the string to start with the date
+    
+    Returns:
+        True if the (leading) 10 characters are NN-NN-NNNN
+    """
+    return (
+        type(value) is str
+        and (len(value) >= 10 if prefix else len(value) == 10)
+        and value[2] == '-'
+        and value[5] == '-'
+        and value[:10].isascii()
+        and value[:2].isdigit()
+        and value[3:5].isdigit()
+        and value[6:10].isdigit()
+    )
+
+
+@dataclass(slots=True)
 class ReputationEntry:
     """Data model for a brand reputation entry."""
     
@@ -17,25 +55,59 @@ class ReputationEntry:
     
     def __post_init__(self):
         """Validate data after initialization."""
-        if not isinstance(self.reputation_score, (int, float)):
+        self._validate(self.reputation_score, self.source_type, self.summary)
+    
+    @staticmethod
+    def _validate(reputation_score: Any, source_type: str, summary: str) -> None:
+        """Validate field values, raising ValueError on the first problem."""
+        score_type = type(reputation_score)
+        if score_type is not float and score_type is not int:
             raise ValueError("reputation_score must be a number")
         
-        if not -1.0 <= self.reputation_score <= 1.0:
+        if not -1.0 <= reputation_score <= 1.0:
             raise ValueError("reputation_score must be between -1.0 and 1.0")
         
-        valid_sources = [
-            'trustpilot', 'yelp', 'google_reviews', 
-            'news', 'blog', 'forum', 'website', 'other'
-        ]
-        if self.source_type not in valid_sources:
-            raise ValueError(f"source_type must be one of {valid_sources}")
+        if source_type not in _VALID_SOURCES:
+            raise ValueError(f"source_type must be one of {list(_SOURCE_TYPES)}")
         
-        if len(self.summary) > 500:
+        if len(summary) > 500:
             raise ValueError("summary must be max 500 characters (1-2 sentences)")
     
+    @classmethod
+    def validate_dict(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate an entry dictionary without building an instance.
+        
+        Applies the same checks as from_dict() and returns a new dict with
+        optional fields defaulted, ready to be written as-is.
+        """
+        entry = {}
+        for field in fields(cls):
+            if field.name in data:
+                entry[field.name] = data[field.name]
+            elif field.default is not MISSING:
+                entry[field.name] = field.default
+            else:
+                raise ValueError(f"missing required field '{field.name}'")
+        
+        unknown = data.keys() - entry.keys()
+        if unknown:
+            raise ValueError(f"unexpected field(s): {sorted(unknown)}")
+        
+        cls._validate(entry['reputation_score'], entry['source_type'], entry['summary'])
+        return entry
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Convert entry to dictionary."""
-        return asdict(self)
+        """Convert entry to dictionary (all fields are scalars, so no deep copy is needed)."""
+        return {
+            'date': self.date,
+            'source_url': self.source_url,
+            'source_type': self.source_type,
+            'reputation_score': self.reputation_score,
+            'summary': self.summary,
+            'scraped_at': self.scraped_at,
+            'raw_data': self.raw_data
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ReputationEntry':
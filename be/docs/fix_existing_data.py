@@ -3,12 +3,33 @@ Fix existing data files that have incorrect dates (YYYY-MM-DD) and raw browser r
 Removes bad entries and keeps only properly formatted LLM-processed entries.
 """
 
-import json
+import io
+import mmap
+import os
+import sys
+import orjson
 import re
 from pathlib import Path
 from datetime import datetime
 import shutil
 
+from db.database import STATS_FILE_NAME
+
+
+_OLD_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')  # YYYY-MM-DD (bad)
+_NEW_DATE_RE = re.compile(r'^\d{2}-\d{2}-\d{4}$')  # MM-DD-YYYY (good)
+
+PROGRESS_EVERY = 100  # files between progress lines when not verbose
+
+# Byte signatures used to triage files without parsing them: an entry's
+# "date" key, and one whose value starts like YYYY- (every bad entry has one)
+_DATE_KEY_RE = re.compile(rb'"date"\s*:')
+_OLD_DATE_VALUE_RE = re.compile(rb'"date"\s*:\s*"\d{4}-')
+
+# Lower-case fragments of browser debug messages that leaked into summaries
+_DEBUG_SUBSTRINGS = ('evaluated step', 'scrolled', 'was the one above', 'from previous screen')
+# One case-insensitive alternation, so each summary is scanned once with no lower() copy
+_DEBUG_RE = re.compile('|'.join(map(re.escape, _DEBUG_SUBSTRINGS)), re.IGNORECASE)
 
 def is_bad_entry(entry: dict) -> bool:
     """
@@ -23,20 +44,20 @@ def is_bad_entry(entry: dict) -> bool:
     score = entry.get('reputation_score', 0)
     summary = entry.get('summary', '')
     
-    # Check if date is in YYYY-MM-DD format (bad)
-    is_old_date_format = re.match(r'^\d{4}-\d{2}-\d{2}$', date)
+    # Entry is bad if it has old date format AND (zero score OR debug message)
+    if not _OLD_DATE_RE.match(date):
+        return False
+    
+    if score == 0.0:
+        return True
     
     # Check if it's a browser debug message
-    is_debug_message = any([
-        'evaluated step' in summary.lower(),
-        'scrolled' in summary.lower(),
-        'was the one above' in summary.lower(),
-        'review 4' in summary.lower() and len(summary) < 50,
-        'from previous screen' in summary.lower(),
-    ])
+    is_debug_message = (
+        _DEBUG_RE.search(summary) is not None
+        or (len(summary) < 50 and 'review 4' in summary.lower())
+    )
     
-    # Entry is bad if it has old date format AND (zero score OR debug message)
-    return is_old_date_format and (score == 0.0 or is_debug_message)
+    return is_debug_message
 
 
 def is_good_entry(entry: dict) -> bool:
@@ -51,15 +72,16 @@ def is_good_entry(entry: dict) -> bool:
     date = entry.get('date', '')
     
     # Check if date is in MM-DD-YYYY format (good)
-    is_new_date_format = re.match(r'^\d{2}-\d{2}-\d{4}$', date)
-    
-    return is_new_date_format
+    return _NEW_DATE_RE.match(date) is not None
 
 
-def fix_data_file(file_path: Path) -> dict:
+def fix_data_file(file_path: Path, verbose: bool = False) -> dict:
     """
     Fix a single data file by removing bad entries.
     
+    Output is buffered and written once per file. Files that need no changes
+    are silent, and per-entry lines are only logged, when verbose is set.
+    
     Returns:
         dict with stats: {
             'total': int,
@@ -68,20 +90,33 @@ def fix_data_file(file_path: Path) -> dict:
             'removed': int
         }
     """
-    print(f"\n📂 Processing: {file_path.name}")
-    print("-" * 80)
+    log = io.StringIO()
+    log.write(f"\n📂 Processing: {file_path.name}\n")
+    log.write("-" * 80 + "\n")
+    
+    # Files without any YYYY-MM-DD date cannot hold a bad entry: count and skip unparsed
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            total = 0
+            is_suspect = False
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                is_suspect = _OLD_DATE_VALUE_RE.search(mm) is not None
+                if not is_suspect:
+                    total = sum(1 for _ in _DATE_KEY_RE.finditer(mm))
     
-    # Backup original file
-    backup_path = file_path.with_suffix('.json.backup')
-    shutil.copy2(file_path, backup_path)
-    print(f"✅ Backup created: {backup_path.name}")
+    if not is_suspect:
+        if verbose:
+            log.write(f"📊 Total entries: {total}\n")
+            log.write(f"\n✅ File already clean, no changes needed\n")
+            sys.stdout.write(log.getvalue())
+        return {'total': total, 'bad': 0, 'good': total, 'removed': 0}
     
     # Read data
-    with open(file_path, 'r') as f:
-        data = json.load(f)
+    data = orjson.loads(file_path.read_bytes())
     
     total = len(data)
-    print(f"📊 Total entries: {total}")
+    log.write(f"📊 Total entries: {total}\n")
     
     # Categorize entries
     bad_entries = []
@@ -90,25 +125,46 @@ def fix_data_file(file_path: Path) -> dict:
     for entry in data:
         if is_bad_entry(entry):
             bad_entries.append(entry)
-            print(f"  ❌ Bad: date={entry.get('date')}, summary={entry.get('summary')[:60]}...")
+            if verbose:
+                log.write(f"  ❌ Bad: date={entry.get('date')}, summary={entry.get('summary')[:60]}...\n")
         elif is_good_entry(entry):
             good_entries.append(entry)
-            print(f"  ✅ Good: date={entry.get('date')}, score={entry.get('reputation_score'):.2f}")
+            if verbose:
+                log.write(f"  ✅ Good: date={entry.get('date')}, score={entry.get('reputation_score'):.2f}\n")
         else:
             # Edge case: not clearly good or bad, keep it but warn
             good_entries.append(entry)
-            print(f"  ⚠️ Unclear: date={entry.get('date')}, keeping it")
+            if verbose:
+                log.write(f"  ⚠️ Unclear: date={entry.get('date')}, keeping it\n")
     
     # Write cleaned data
     if bad_entries:
-        with open(file_path, 'w') as f:
-            json.dump(good_entries, f, indent=2)
+        # Backup original file: hard link when possible (no bytes copied); the
+        # cleaned data goes to a new inode via os.replace so the link keeps the original
+        backup_path = file_path.with_suffix('.json.backup')
+        backup_path.unlink(missing_ok=True)
+        try:
+            os.link(file_path, backup_path)
+        except OSError:
+            shutil.copy2(file_path, backup_path)
+        log.write(f"✅ Backup created: {backup_path.name}\n")
         
-        print(f"\n✅ File cleaned!")
-        print(f"   Removed: {len(bad_entries)} bad entries")
-        print(f"   Kept: {len(good_entries)} good entries")
+        tmp_path = file_path.with_suffix('.json.tmp')
+        tmp_path.write_bytes(orjson.dumps(good_entries, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, file_path)
+        
+        # Running brand stats no longer match; the API rebuilds them on next read
+        # (or run `python -m db.database --rebuild`)
+        (file_path.parent / STATS_FILE_NAME).unlink(missing_ok=True)
+        
+        log.write(f"\n✅ File cleaned!\n")
+        log.write(f"   Removed: {len(bad_entries)} bad entries\n")
+        log.write(f"   Kept: {len(good_entries)} good entries\n")
     else:
-        print(f"\n✅ File already clean, no changes needed")
+        log.write(f"\n✅ File already clean, no changes needed\n")
+    
+    if verbose or bad_entries:
+        sys.stdout.write(log.getvalue())
     
     return {
         'total': total,
@@ -118,9 +174,35 @@ def fix_data_file(file_path: Path) -> dict:
     }
 
 
-def fix_all_brand_data(brands_dir: str = "brands") -> None:
+def find_data_files(brands_path: Path) -> list:
+    """
+    List day_*_data.json files one level below brands_path.
+    
+    Walks exactly two directory levels with os.scandir and matches on the
+    name, so backups, temp files and _files.json/_stats.json are never picked up.
+    """
+    data_files = []
+    
+    with os.scandir(brands_path) as brand_dirs:
+        for brand_dir in brand_dirs:
+            if not brand_dir.is_dir():
+                continue
+            
+            with os.scandir(brand_dir.path) as entries:
+                for entry in entries:
+                    if entry.name.startswith('day_') and entry.name.endswith('_data.json'):
+                        data_files.append(Path(entry.path))
+    
+    return data_files
+
+
+def fix_all_brand_data(brands_dir: str = "brands", verbose: bool = False) -> None:
     """
     Fix all data files in all brand directories.
+    
+    Args:
+        brands_dir: Directory holding one folder per brand
+        verbose: Log every file and entry instead of only files that change
     """
     brands_path = Path(brands_dir)
     
@@ -140,7 +222,7 @@ def fix_all_brand_data(brands_dir: str = "brands") -> None:
     }
     
     # Find all data files
-    data_files = list(brands_path.glob("*/day_*.json"))
+    data_files = find_data_files(brands_path)
     
     if not data_files:
         print("\n❌ No data files found")
@@ -149,8 +231,11 @@ def fix_all_brand_data(brands_dir: str = "brands") -> None:
     print(f"\n📁 Found {len(data_files)} data files to check")
     
     # Process each file
-    for file_path in data_files:
-        stats = fix_data_file(file_path)
+    for i, file_path in enumerate(data_files, 1):
+        stats = fix_data_file(file_path, verbose)
+        
+        if not verbose and i % PROGRESS_EVERY == 0:
+            print(f"   ... checked {i}/{len(data_files)} files")
         
         all_stats['files_processed'] += 1
         all_stats['total_entries'] += stats['total']
@@ -177,4 +262,4 @@ def fix_all_brand_data(brands_dir: str = "brands") -> None:
 
 
 if __name__ == "__main__":
-    fix_all_brand_data()
+    fix_all_brand_data(verbose="-v" in sys.argv[1:] or "--verbose" in sys.argv[1:])
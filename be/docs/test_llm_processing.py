@@ -4,8 +4,9 @@ Test LLM post-processing with sample Browser.cash responses
 
 from scraper.llm_processor import process_with_llm
 
-# Sample messy Browser.cash response (similar to what we actually get)
-sample_trustpilot_response = """
+# Sample messy Browser.cash response (similar to what we actually get), kept as
+# bytes like the raw HTTP body; process_with_llm decodes it once
+sample_trustpilot_response = b"""
 Okay, I scrolled and found the 5 most recent reviews:
 
 1. Ayesha Amna - November 15, 2025 - 1 star
@@ -32,7 +33,7 @@ print("=" * 80)
 
 print("\n📥 INPUT (Browser.cash response):")
 print("-" * 80)
-print(sample_trustpilot_response)
+print(sample_trustpilot_response.decode())
 print("-" * 80)
 
 print("\n🤖 PROCESSING WITH LLM...")
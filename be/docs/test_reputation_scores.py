@@ -0,0 +1,52 @@
+"""
+Test that batch scoring matches per-text scoring, including out-of-range ratings
+"""
+
+from scraper.scraper import calculate_reputation_score, calculate_reputation_scores
+
+print("=" * 80)
+print("TESTING BATCH REPUTATION SCORING")
+print("=" * 80)
+
+texts = [
+    "",
+    "Great product, highly recommend it",
+    "Terrible, awful, horrible, the worst, bad",
+    "Excellent amazing fantastic wonderful",
+    "Badge shown but never arrived, a scam and a waste",
+    "Good value, some issue with shipping",
+]
+ratings = [None, 0, 1, 2.5, 3, 3.5, 4, 4.5, 5, 6, 10, -2]
+
+print("\nRunning test cases...\n")
+
+passed = 0
+failed = 0
+
+for rating in ratings:
+    expected = [calculate_reputation_score(text, rating) for text in texts]
+    result = calculate_reputation_scores(texts, [rating] * len(texts))
+    
+    if result == expected:
+        print(f"✅ PASS: rating={rating}")
+        passed += 1
+    else:
+        print(f"❌ FAIL: rating={rating}")
+        print(f"   Expected: {expected}")
+        print(f"   Got:      {result}")
+        failed += 1
+
+no_ratings = calculate_reputation_scores(texts) == [calculate_reputation_score(text) for text in texts]
+print(f"{'✅ PASS' if no_ratings else '❌ FAIL'}: ratings omitted")
+passed += no_ratings
+failed += not no_ratings
+
+print()
+print("=" * 80)
+print(f"RESULTS: {passed} passed, {failed} failed out of {len(ratings) + 1} tests")
+print("=" * 80)
+
+if failed == 0:
+    print("\n✅ Batch scores match calculate_reputation_score!")
+else:
+    print("\n❌ Batch scores differ from calculate_reputation_score")
@@ -1,13 +1,48 @@
-from flask import Flask, request, jsonify
+import gzip
+import hashlib
+import logging
+import os
+import random
+import time
+from threading import Lock, Thread
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-from typing import Optional
+from cachetools import LRUCache
+from typing import Optional, Tuple, Dict, Any
 from api import api_bp
+from api.json_provider import OrjsonProvider, json_body
+
+# Modules that log (scraper.llm_processor) inherit this; CLARITY_LOG=DEBUG shows per-call detail
+logging.basicConfig(
+    level=os.environ.get("CLARITY_LOG", "INFO").upper(),
+    format="[%(name)s] %(levelname)s: %(message)s"
+)
+# httpx logs every request at INFO; background Browser.cash polls and LLM
+# calls would flood stdout, so keep the HTTP clients to warnings
+for _noisy_logger in ("httpx", "httpcore"):
+    logging.getLogger(_noisy_logger).setLevel(logging.WARNING)
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 app.register_blueprint(api_bp)
 
+# Finished searches never change: serialize (and gzip) their payload once,
+# with an ETag so repeat requests can be answered 304
+_finished_bodies: "LRUCache[str, Tuple[bytes, bytes, str]]" = LRUCache(maxsize=256)
+_finished_bodies_lock = Lock()
+
+POLL_INTERVAL = 3    # seconds between Browser.cash checks of each in-flight search
+MAX_POLL_INTERVAL = 15  # backoff cap for a search whose tasks show no progress
+MAX_LONG_POLL = 25   # cap on GET /search/{search_id}?wait=
+MIN_STREAM_INTERVAL = 1.0   # bounds on GET /search/{search_id}/stream?interval=
+MAX_STREAM_INTERVAL = 60.0
+TASK_CLEANUP_INTERVAL = 60  # seconds between sweeps of expired background tasks
+
+_poller_started = False
+_poller_lock = Lock()
+
 
 @app.route("/", methods=["GET"])
 def root():
@@ -24,6 +59,7 @@ def root():
             "agentic_search": {
                 "initiate": "POST /search",
                 "status": "GET /search/{search_id}",
+                "stream": "GET /search/{search_id}/stream",
                 "description": "Real-time agentic search using Browser.cash"
             },
             "brands": {
@@ -55,12 +91,14 @@ def search():
     }
     
     Returns:
-        202 Accepted with search_id and task_ids for polling
+        202 Accepted with search_id for polling; Browser.cash tasks are created
+        in the background, so task_ids is empty until GET /search/{search_id}
+        reports per-source progress
     """
-    from scraper import scrape_brand
     from api.search_manager import search_manager
+    from api.task_manager import task_manager
     
-    data = request.get_json()
+    data = json_body()
     
     if not data or "query" not in data:
         return jsonify({"error": "Missing 'query' in request body"}), 400
@@ -70,77 +108,162 @@ def search():
     auto_save = data.get("auto_save", True)
     website_url = data.get("website_url", "")
     
+    search_id = search_manager.create_search(
+        query=query,
+        task_ids={},
+        auto_save=auto_save,
+        sources=sources
+    )
+    
+    # Browser.cash task creation runs on a worker; the request returns immediately
+    task_manager.submit(_start_search, search_id, query, sources, website_url)
+    _ensure_poller()
+    
+    search_manager.cleanup_expired()
+    search = search_manager.get_search(search_id)
+    
+    return jsonify({
+        "search_id": search_id,
+        "query": query,
+        "task_ids": search["task_ids"],
+        "status": "processing",
+        "status_url": f"/search/{search_id}",
+        "created_at": search["created_at"]
+    }), 202
+
+
+def _start_search(search_id: str, query: str, sources: list, website_url: str) -> None:
+    """Create the Browser.cash tasks for a search (worker thread)."""
+    from scraper import scrape_brand
+    from api.search_manager import search_manager
+    
     try:
         result = scrape_brand(query, sources, website_url)
         
-        search_id = search_manager.create_search(
-            query=query,
-            task_ids=result["task_ids"],
-            auto_save=auto_save,
-            sources=sources
-        )
-        
-        search_manager.cleanup_expired()
+        if not result["task_ids"]:
+            # No valid source or no task created: nothing for the poller to wait on
+            search_manager.update_search(
+                search_id,
+                status="completed",
+                task_ids={},
+                results=[],
+                stats=_search_stats({}),
+                saved_to_db=False,
+                progress={"completed": 0, "total": 0, "sources": {}}
+            )
+            return
         
-        return jsonify({
-            "search_id": search_id,
-            "query": query,
-            "task_ids": result["task_ids"],
-            "status": "processing",
-            "status_url": f"/search/{search_id}",
-            "created_at": result["created_at"]
-        }), 202
-    
+        search_manager.update_search(search_id, task_ids=result["task_ids"])
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        search_manager.update_search(search_id, status="failed", error=str(e))
 
 
-@app.route("/search/<search_id>", methods=["GET"])
-def get_search_status(search_id: str):
+def _parse_sources(answers: Dict[str, str], query: str) -> Dict[str, Dict[str, Any]]:
     """
-    Get status and results of a search by ID.
+    Run LLM post-processing for a batch of sources' answers concurrently (worker thread).
+    
+    Each source's score count and sum are accumulated here, as its entries
+    arrive, so completing the search only has to combine per-source totals.
+    """
+    from scraper import parse_scrape_results
+    
+    source_urls = {source: f"https://{source}.com" for source in answers}
+    parsed = parse_scrape_results(answers, query, source_urls)
+    
+    results = {}
+    for source, entries in parsed.items():
+        # One pass: serialize each entry and fold its score into the source total
+        dicts = []
+        score_sum = 0.0
+        for entry in entries:
+            dicts.append(entry.to_dict())
+            score_sum += entry.reputation_score
+        results[source] = {"entries": dicts, "count": len(dicts), "score_sum": score_sum}
+    
+    return results
+
+
+def _search_stats(source_totals: Dict[str, Tuple[int, float]]) -> Dict[str, Any]:
+    """Build search stats from per-source (count, score_sum) totals."""
+    total = sum(count for count, _ in source_totals.values())
+    score_sum = sum(source_sum for _, source_sum in source_totals.values())
+    
+    return {
+        "total_results": total,
+        "average_score": score_sum / total if total else 0.0,
+        "by_source": {
+            source: {"count": count, "avg_score": source_sum / count}
+            for source, (count, source_sum) in source_totals.items()
+            if count
+        }
+    }
+
+
+def _advance_search(search_id: str) -> bool:
+    """
+    Advance a search by checking Browser.cash and collecting parsed results (poller thread).
+    
+    Progress and results are written to search_manager, which wakes any
+    request long-polling or streaming this search.
     
     Returns:
-        - While processing: progress information
-        - When complete: full results with reputation data
-        - If not found: 404 error
+        True if the search changed or has LLM post-processing in flight
+        (keep polling at the base interval), False if nothing moved
     """
-    from scraper import check_scraping_status, parse_scrape_result
-    from db import save_brand_data
-    from db.models import ReputationEntry
+    from scraper import check_scraping_status
+    from db import bulk_save_brand_data
     from api.search_manager import search_manager
+    from api.task_manager import task_manager
+    from api.cache import invalidate_brand_cache
     
     search = search_manager.get_search(search_id)
     
-    if not search:
-        return jsonify({"error": "Search not found"}), 404
-    
-    if search["status"] == "completed":
-        return jsonify(search), 200
-    
-    if search["status"] == "failed":
-        return jsonify(search), 200
+    if not search or search["status"] != "processing" or not search["task_ids"]:
+        return False
     
     try:
         task_statuses = check_scraping_status(search["task_ids"])
+        parse_tasks = dict(search.get("parse_tasks") or {})
+        
+        # Sources whose answers arrived this tick share one job, whose LLM calls run concurrently
+        ready = {
+            source: status_info["answer"]
+            for source, status_info in task_statuses.items()
+            if status_info.get("answer") and source not in parse_tasks
+        }
+        if ready:
+            batch_id = task_manager.submit(_parse_sources, ready, search["query"])
+            parse_tasks.update(dict.fromkeys(ready, batch_id))
         
         completed_sources = []
         processing_sources = []
         failed_sources = []
         all_results = []
+        parsing = False
+        source_totals = {}
+        source_progress = {}
         
         for source, status_info in task_statuses.items():
             status = status_info.get("status")
             answer = status_info.get("answer")
+            source_progress[source] = status or "unknown"
             
-            # Only count as completed if we have the answer
+            # Once Browser.cash has the answer, LLM post-processing runs on a worker
             if answer:
-                completed_sources.append(source)
-                source_url = f"https://{source}.com"
-                entries = parse_scrape_result(answer, source, source_url, search["query"])
+                parse_task = task_manager.get_task(parse_tasks[source]) or {"status": "failed"}
                 
-                for entry in entries:
-                    all_results.append(entry.to_dict())
+                if parse_task["status"] == "completed":
+                    parsed = parse_task["result"][source]
+                    completed_sources.append(source)
+                    all_results.extend(parsed["entries"])
+                    source_totals[source] = (parsed["count"], parsed["score_sum"])
+                elif parse_task["status"] == "failed":
+                    failed_sources.append(source)
+                    source_progress[source] = "failed"
+                else:
+                    processing_sources.append(source)
+                    source_progress[source] = "processing"
+                    parsing = True
             
             elif status in ["failed", "error"]:
                 failed_sources.append(source)
@@ -151,32 +274,22 @@ def get_search_status(search_id: str):
         total_sources = len(task_statuses)
         completed_count = len(completed_sources)
         total_finished = completed_count + len(failed_sources)
+        progress = {
+            "completed": completed_count,
+            "total": total_sources,
+            "sources": source_progress
+        }
         
         # Only mark as complete when ALL sources have finished (have answers or failed)
         if total_finished == total_sources:
-            stats = {
-                "total_results": len(all_results),
-                "average_score": sum(r["reputation_score"] for r in all_results) / len(all_results) if all_results else 0.0,
-                "by_source": {}
-            }
-            
-            for result in all_results:
-                source = result["source_type"]
-                if source not in stats["by_source"]:
-                    stats["by_source"][source] = {"count": 0, "scores": []}
-                stats["by_source"][source]["count"] += 1
-                stats["by_source"][source]["scores"].append(result["reputation_score"])
-            
-            for source in stats["by_source"]:
-                scores = stats["by_source"][source]["scores"]
-                stats["by_source"][source]["avg_score"] = sum(scores) / len(scores)
-                del stats["by_source"][source]["scores"]
+            stats = _search_stats(source_totals)
             
             saved_to_db = False
             if search["auto_save"] and all_results:
                 try:
-                    entries = [ReputationEntry.from_dict(r) for r in all_results]
-                    save_brand_data(search["query"], entries)
+                    # Results are already validated entry dicts from the parser
+                    bulk_save_brand_data(search["query"], all_results)
+                    invalidate_brand_cache()
                     saved_to_db = True
                 except Exception as e:
                     print(f"Failed to save to DB: {e}")
@@ -186,43 +299,226 @@ def get_search_status(search_id: str):
                 status="completed",
                 results=all_results,
                 stats=stats,
-                saved_to_db=saved_to_db
+                saved_to_db=saved_to_db,
+                parse_tasks=parse_tasks,
+                progress=progress
             )
+            return True
+        
+        # Only publish real changes, so waiters are not woken every poll
+        changed = progress != search.get("progress") or parse_tasks != search["parse_tasks"]
+        if changed:
+            search_manager.update_search(search_id, progress=progress, parse_tasks=parse_tasks)
+        return changed or parsing
+    
+    except Exception as e:
+        search_manager.update_search(search_id, status="failed", error=str(e))
+        return True
+
+
+def _poll_delay(idle_polls: int) -> float:
+    """Seconds until a search's next check: exponential backoff with jitter while nothing moves."""
+    delay = min(MAX_POLL_INTERVAL, POLL_INTERVAL * 1.5 ** idle_polls)
+    return delay * random.uniform(0.9, 1.1)
+
+
+def _poll_active_searches() -> None:
+    """
+    Advance in-flight searches as their checks come due (poller thread).
+    
+    A search is checked every POLL_INTERVAL while it makes progress; each
+    check that finds nothing new backs it off (up to MAX_POLL_INTERVAL).
+    """
+    from api.search_manager import search_manager
+    from api.task_manager import task_manager
+    
+    # search_id -> (monotonic time of next check, consecutive idle checks)
+    schedule: Dict[str, Tuple[float, int]] = {}
+    next_cleanup = time.monotonic() + TASK_CLEANUP_INTERVAL
+    
+    while True:
+        now = time.monotonic()
+        active = set()
+        
+        # Search-path jobs (task creation, parse batches holding every parsed
+        # entry) bypass /api/scrape/process, which is the only other sweeper
+        if now >= next_cleanup:
+            task_manager.cleanup_expired()
+            next_cleanup = now + TASK_CLEANUP_INTERVAL
+        
+        for search in search_manager.list_active_searches():
+            if search["status"] != "processing" or not search["task_ids"]:
+                continue
             
-            return jsonify({
-                "search_id": search_id,
-                "status": "completed",
-                "query": search["query"],
-                "results": all_results,
-                "stats": stats,
-                "saved_to_db": saved_to_db,
-                "created_at": search["created_at"]
-            }), 200
+            search_id = search["search_id"]
+            active.add(search_id)
+            due, idle_polls = schedule.get(search_id, (now, 0))
+            if due > now:
+                continue
+            
+            idle_polls = 0 if _advance_search(search_id) else idle_polls + 1
+            schedule[search_id] = (time.monotonic() + _poll_delay(idle_polls), idle_polls)
+        
+        for search_id in schedule.keys() - active:
+            del schedule[search_id]
         
-        else:
-            source_progress = {}
-            for source, status_info in task_statuses.items():
-                source_progress[source] = status_info.get("status", "unknown")
+        # Wake for the next due check, and at least every POLL_INTERVAL for new searches
+        next_wake = min((due for due, _ in schedule.values()), default=now + POLL_INTERVAL)
+        time.sleep(max(0.05, min(next_wake, now + POLL_INTERVAL) - time.monotonic()))
+
+
+def _ensure_poller() -> None:
+    """Start the background search poller on first use."""
+    global _poller_started
+    
+    with _poller_lock:
+        if not _poller_started:
+            Thread(target=_poll_active_searches, name="clarity-search-poller", daemon=True).start()
+            _poller_started = True
+
+
+def _search_payload(search_id: str) -> Tuple[Dict[str, Any], int]:
+    """
+    Build the status response for a search from its stored state.
+    
+    Returns:
+        (response payload, HTTP status code)
+    """
+    from api.search_manager import search_manager
+    
+    search = search_manager.get_search(search_id)
+    
+    if not search:
+        return {"error": "Search not found"}, 404
+    
+    if search["status"] in ("completed", "failed"):
+        return search, 200
+    
+    # Pending until Browser.cash tasks exist and the poller has checked them
+    progress = search.get("progress") or {
+        "completed": 0,
+        "total": len(search["sources"]),
+        "sources": {source: "pending" for source in search["sources"]}
+    }
+    
+    return {
+        "search_id": search_id,
+        "status": "processing",
+        "query": search["query"],
+        "progress": progress,
+        "created_at": search["created_at"]
+    }, 200
+
+
+@app.route("/search/<search_id>", methods=["GET"])
+def get_search_status(search_id: str):
+    """
+    Get status and results of a search by ID.
+    
+    Query params:
+        - wait: Seconds to hold the request open for the next change while
+          the search is processing (long-poll, max 25, default: 0)
+    
+    Returns:
+        - While processing: progress information
+        - When complete: full results with reputation data
+        - If not found: 404 error
+    """
+    from api.search_manager import search_manager
+    
+    wait = request.args.get("wait", default=0.0, type=float)
+    search = search_manager.get_search(search_id)
+    
+    if wait > 0 and search and search["status"] == "processing":
+        search_manager.wait_for_update(search_id, timeout=min(wait, MAX_LONG_POLL))
+    
+    payload, status_code = _search_payload(search_id)
+    
+    if status_code != 200 or payload.get("status") not in ("completed", "failed"):
+        # Progress changes between polls; never let a browser or CDN reuse it
+        response = jsonify(payload)
+        response.headers["Cache-Control"] = "no-store"
+        return response, status_code
+    
+    with _finished_bodies_lock:
+        bodies = _finished_bodies.get(search_id)
+    
+    if bodies is None:
+        body = app.json.dumps(payload).encode()
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+        bodies = (body, gzip.compress(body, compresslevel=6), etag)
+        with _finished_bodies_lock:
+            _finished_bodies[search_id] = bodies
+    
+    body, gzipped, etag = bodies
+    
+    # Only completed results are pinned; failed ones are revalidated (a cheap
+    # 304) rather than cached as an error for an hour
+    headers = {
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "public, max-age=3600, immutable" if payload["status"] == "completed" else "no-cache"
+    }
+    
+    # Each content-coding is its own representation, so it needs its own strong
+    # ETag; Vary (set above on both) keeps caches from mixing the two bodies.
+    # quality() rather than `in`, so "gzip;q=0" counts as a refusal
+    if request.accept_encodings.quality("gzip") > 0:
+        body, etag = gzipped, f"{etag}-gz"
+        headers["Content-Encoding"] = "gzip"
+    
+    if request.if_none_match.contains(etag):
+        headers.pop("Content-Encoding", None)
+        response = Response(status=304, headers=headers)
+    else:
+        response = Response(body, mimetype="application/json", headers=headers)
+    
+    response.set_etag(etag)
+    return response
+
+
+@app.route("/search/<search_id>/stream", methods=["GET"])
+def stream_search_status(search_id: str):
+    """
+    Stream status changes of a search as server-sent events.
+    
+    Emits a `data: {...}` event (same payload as GET /search/{search_id})
+    whenever the status or progress changes, and closes the stream once the
+    search is completed or failed. Replaces client-side polling with a single
+    long-lived connection.
+    
+    Query params:
+        - interval: Maximum seconds between re-checks when nothing changed (default: 15, clamped to 1-60)
+    """
+    from api.search_manager import search_manager
+    
+    if not search_manager.get_search(search_id):
+        return jsonify({"error": "Search not found"}), 404
+    
+    interval = request.args.get("interval", default=15.0, type=float)
+    # A zero or negative interval would make wait_for_update return at once and spin the stream
+    interval = max(MIN_STREAM_INTERVAL, min(interval, MAX_STREAM_INTERVAL))
+    
+    def generate():
+        last_event = None
+        while True:
+            payload, _ = _search_payload(search_id)
+            event = app.json.dumps(payload)
             
-            return jsonify({
-                "search_id": search_id,
-                "status": "processing",
-                "query": search["query"],
-                "progress": {
-                    "completed": completed_count,
-                    "total": total_sources,
-                    "sources": source_progress
-                },
-                "created_at": search["created_at"]
-            }), 200
+            if event != last_event:
+                yield f"data: {event}\n\n"
+                last_event = event
+            
+            if payload.get("status") != "processing":
+                return
+            
+            # Woken as soon as the poller publishes a change
+            search_manager.wait_for_update(search_id, timeout=interval)
     
-    except Exception as e:
-        search_manager.update_search(search_id, status="failed")
-        return jsonify({
-            "search_id": search_id,
-            "status": "failed",
-            "error": str(e)
-        }), 500
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.route("/health", methods=["GET"])
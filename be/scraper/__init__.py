@@ -1,10 +1,12 @@
-from .scraper import scrape_brand, parse_scrape_result, calculate_reputation_score, check_scraping_status
+from .scraper import scrape_brand, parse_scrape_result, parse_scrape_results, calculate_reputation_score, calculate_reputation_scores, check_scraping_status
 from .prompts import PROMPTS
 
 __all__ = [
     'scrape_brand',
     'parse_scrape_result',
+    'parse_scrape_results',
     'calculate_reputation_score',
+    'calculate_reputation_scores',
     'check_scraping_status',
     'PROMPTS'
 ]
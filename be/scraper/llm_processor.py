@@ -5,13 +5,31 @@ This module uses AI to extract and format data from messy Browser.cash responses
 into our exact required structure with proper dates, summaries, and sentiment scores.
 """
 
-from ai.llm import respond
+import asyncio
+import hashlib
+import logging
+import os
+from itertools import count
+from pathlib import Path
+from threading import Lock, get_ident
+
+from cachetools import TTLCache
+
+from ai.llm import respond_async, run_async
+from db.models import is_mmddyyyy
+from .prompts import split_template, fill_template
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
 import json
+import orjson
 import re
 
 
+# Lazy %-style logging: per-item/per-call detail costs only an isEnabledFor
+# check unless CLARITY_LOG=DEBUG
+logger = logging.getLogger(__name__)
+
+
 LLM_FORMAT_PROMPT = """You are a data formatting assistant. Your job is to extract structured information from web scraping results.
 
 SOURCE TYPE: {source_type}
@@ -101,104 +119,499 @@ IMPORTANT:
 Return the JSON array now:"""
 
 
-def process_with_llm(
-    raw_answer: str,
+def _batch_instructions() -> str:
+    """Reuse LLM_FORMAT_PROMPT's TASK..IMPORTANT rules, reworded for one array per source."""
+    rules = LLM_FORMAT_PROMPT[
+        LLM_FORMAT_PROMPT.index("TASK:"):LLM_FORMAT_PROMPT.index("Return the JSON array now:")
+    ]
+    for old, new in (
+        ("Extract and format this data into a JSON array.",
+         "Extract and format each source's data into its own JSON array."),
+        ("- Return ONLY valid JSON array, no markdown, no explanation",
+         "- Return ONLY valid JSON, no markdown, no explanation"),
+    ):
+        assert old in rules, old
+        rules = rules.replace(old, new)
+    return rules
+
+
+# Several sources' answers formatted in one LLM call (see process_all)
+BATCH_FORMAT_PROMPT = """You are a data formatting assistant. Your job is to extract structured information from web scraping results for several sources at once.
+
+BRAND: {brand_name}
+
+RAW DATA FROM BROWSER.CASH (one block per source):
+{raw_blocks}
+
+""" + _batch_instructions() + """BATCH OUTPUT:
+- Return ONE JSON object whose keys are exactly: {source_keys}
+- Each value is the JSON array for that source, following the rules above
+- Use an empty array for a source with no usable data
+
+Return the JSON object now:"""
+
+
+# Templates split once at import so building a prompt is a join instead of
+# re-scanning the whole template with str.format
+_PROMPT_PARTS = split_template(LLM_FORMAT_PROMPT)
+_BATCH_PROMPT_PARTS = split_template(BATCH_FORMAT_PROMPT)
+
+_MD_JSON_RE = re.compile(r'```(?:json)?\s*')
+_json_decoder = json.JSONDecoder()
+
+# Raw answers are trimmed to a token budget rather than a fixed char count.
+# ~4 ASCII chars per token; CJK/emoji-heavy text is closer to 1 token per char.
+RAW_DATA_TOKEN_BUDGET = 3000
+_CHARS_PER_TOKEN = 4
+
+# An answer already carrying these on every item needs no LLM formatting
+_STRUCTURED_FIELDS = ('date', 'summary', 'sentiment_score')
+
+_HTML_TAG_RE = re.compile(r'<[a-zA-Z/!][^>]*>')
+_BLANK_LINES_RE = re.compile(r'\s*\n\s*')
+_SPACES_RE = re.compile(r'[ \t\r\f\v]+')
+
+# Repeat searches within the hour reuse the formatted output for an identical
+# answer instead of paying for another LLM call. Values are orjson bytes so
+# callers never share (and mutate) the cached dicts.
+_llm_result_cache: "TTLCache[str, bytes]" = TTLCache(maxsize=1024, ttl=3600)
+_llm_result_lock = Lock()
+
+# Results are also kept on disk (one <key>.json per answer) so restarts and
+# reprocessing runs in other processes skip the LLM too. Least recently used
+# files are pruned once the directory grows past LLM_DISK_CACHE_MAX_FILES.
+LLM_DISK_CACHE_DIR = Path(os.getenv(
+    "CLARITY_LLM_CACHE_DIR", Path(__file__).parent.parent / ".cache" / "llm"
+))
+LLM_DISK_CACHE_MAX_FILES = 2048
+_DISK_PRUNE_EVERY = 64  # writes between directory scans
+_disk_writes = count(1)
+
+
+def _llm_cache_key(raw_answer: str, source_type: str, brand_name: str, today_str: str) -> str:
+    """Content hash of everything that shapes the prompt (relative dates depend on today)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{source_type}|{brand_name}|{today_str}|".encode())
+    digest.update(raw_answer.encode('utf-8', errors='replace'))
+    return digest.hexdigest()
+
+
+def _parse_structured_answer(raw_answer: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return the answer's items if it is already a JSON array in our output shape.
+    
+    Args:
+        raw_answer: Decoded Browser.cash answer
+    
+    Returns:
+        List of item dicts carrying every _STRUCTURED_FIELDS key with an
+        MM-DD-YYYY date, or None if the answer still needs LLM formatting
+    """
+    # Peek at the head instead of strip()-copying a possibly large answer;
+    # orjson accepts the surrounding whitespace itself
+    if not raw_answer[:64].lstrip().startswith('['):
+        return None
+    
+    try:
+        data = orjson.loads(raw_answer)
+    except orjson.JSONDecodeError:
+        return None
+    
+    if data and all(
+        isinstance(item, dict)
+        and all(key in item for key in _STRUCTURED_FIELDS)
+        and is_mmddyyyy(item['date'], prefix=True)
+        for item in data
+    ):
+        return data
+    return None
+
+
+def _clean_items(data: List[Any], today_str: str) -> List[Dict[str, Any]]:
+    """Keep dict items, defaulting bad dates to today and clamping sentiment_score to [-1, 1]."""
+    cleaned_data = []
+    for item in data:
+        if isinstance(item, dict):
+            # Ensure date is in correct format
+            date = item.get('date', today_str)
+            if not is_mmddyyyy(date, prefix=True):
+                # Try to fix common formats
+                logger.warning("Invalid date format %r, using today", date)
+                item['date'] = today_str
+            
+            # Ensure sentiment_score is in range
+            score = item.get('sentiment_score', 0.0)
+            try:
+                score = float(score)
+                score = max(-1.0, min(1.0, score))
+                item['sentiment_score'] = score
+            except:
+                item['sentiment_score'] = 0.0
+            
+            cleaned_data.append(item)
+    
+    return cleaned_data
+
+
+def _extract_json(text: str, openers: str = '[{') -> Any:
+    """
+    Parse the JSON value in an LLM response.
+    
+    Clean responses parse in one orjson pass. Otherwise each '[' (then '{')
+    is tried as the start of a value with JSONDecoder.raw_decode, whose C
+    scanner stops at the end of that value, so surrounding prose is never
+    regex-scanned or copied.
+    
+    Args:
+        text: LLM response with markdown fences already removed
+        openers: Start characters to try, in order of preference
+    
+    Returns:
+        The decoded value (normally a list of item dicts)
+    
+    Raises:
+        json.JSONDecodeError: If no JSON array or object can be decoded
+    """
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError as e:
+        error = e
+    
+    for opener in openers:
+        start = text.find(opener)
+        while start >= 0:
+            try:
+                return _json_decoder.raw_decode(text, start)[0]
+            except json.JSONDecodeError:
+                start = text.find(opener, start + 1)
+    
+    raise error
+
+
+def _date_fields() -> Dict[str, str]:
+    """Today and the relative-date examples the prompts resolve against, as MM-DD-YYYY."""
+    current_date = datetime.now()
+    today_str = current_date.strftime("%m-%d-%Y")
+    return {
+        "current_date": today_str,
+        "today": today_str,
+        "yesterday": (current_date - timedelta(days=1)).strftime("%m-%d-%Y"),
+        "three_days_ago": (current_date - timedelta(days=3)).strftime("%m-%d-%Y"),
+    }
+
+
+async def _cache_get(cache_key: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fresh copy of a cached formatting result (memory, then disk), or None.
+    
+    Disk access runs on a worker thread so it never blocks the shared LLM loop.
+    """
+    with _llm_result_lock:
+        cached = _llm_result_cache.get(cache_key)
+    
+    if cached is None:
+        cached = await asyncio.to_thread(_disk_cache_read, cache_key)
+        if cached is None:
+            return None
+        
+        with _llm_result_lock:
+            _llm_result_cache[cache_key] = cached
+    
+    return orjson.loads(cached)
+
+
+def _disk_cache_read(cache_key: str) -> Optional[bytes]:
+    """Read a cached result file and mark it recently used (blocking)."""
+    path = LLM_DISK_CACHE_DIR / f"{cache_key}.json"
+    try:
+        cached = path.read_bytes()
+        os.utime(path)  # mark as recently used for pruning
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning("LLM disk cache read failed for %s: %s", path.name, e)
+        return None
+    return cached
+
+
+def _prune_disk_cache() -> None:
+    """Delete least recently used disk cache files beyond LLM_DISK_CACHE_MAX_FILES."""
+    try:
+        files = [(entry.stat().st_mtime, entry) for entry in os.scandir(LLM_DISK_CACHE_DIR)]
+    except OSError:
+        return
+    
+    excess = len(files) - LLM_DISK_CACHE_MAX_FILES
+    if excess <= 0:
+        return
+    
+    files.sort(key=lambda f: f[0])
+    for _, entry in files[:excess]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+async def _cache_put(cache_key: str, cleaned_data: List[Dict[str, Any]]) -> None:
+    """Cache a non-empty formatting result in memory and (on a worker thread) on disk."""
+    if not cleaned_data:
+        return
+    
+    encoded = orjson.dumps(cleaned_data)
+    with _llm_result_lock:
+        _llm_result_cache[cache_key] = encoded
+    
+    await asyncio.to_thread(_disk_cache_write, cache_key, encoded)
+
+
+def _disk_cache_write(cache_key: str, encoded: bytes) -> None:
+    """Write a cached result file atomically, pruning old files now and then (blocking)."""
+    path = LLM_DISK_CACHE_DIR / f"{cache_key}.json"
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{get_ident()}.tmp")
+    try:
+        LLM_DISK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_bytes(encoded)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("LLM disk cache write failed for %s: %s", path.name, e)
+        return
+    
+    if next(_disk_writes) % _DISK_PRUNE_EVERY == 0:
+        _prune_disk_cache()
+
+
+def _compact_raw_data(raw_answer: str, max_tokens: int = RAW_DATA_TOKEN_BUDGET) -> str:
+    """
+    Strip markup and redundant whitespace, then cut to an approximate token budget.
+    
+    Args:
+        raw_answer: Decoded Browser.cash answer
+        max_tokens: Approximate number of prompt tokens to spend on the raw data
+    
+    Returns:
+        Text that fits the budget, keeping line breaks between items
+    """
+    text = _HTML_TAG_RE.sub(' ', raw_answer)
+    text = _SPACES_RE.sub(' ', text)
+    text = _BLANK_LINES_RE.sub('\n', text).strip()
+    
+    budget = max_tokens * _CHARS_PER_TOKEN
+    if text.isascii() or len(text) <= max_tokens:
+        return text[:budget]
+    
+    # Non-ASCII chars cost about a token each
+    for i, ch in enumerate(text):
+        budget -= 1 if ch < '\x80' else _CHARS_PER_TOKEN
+        if budget < 0:
+            return text[:i]
+    return text
+
+
+async def process_with_llm_async(
+    raw_answer: Union[str, bytes],
     source_type: str,
     brand_name: str
 ) -> List[Dict[str, Any]]:
     """
     Process Browser.cash raw answer using LLM to extract structured data.
     
+    Awaits the shared async LLM client, so several sources can be formatted
+    concurrently (see process_all).
+    
     Args:
-        raw_answer: Raw response from Browser.cash
+        raw_answer: Raw response from Browser.cash (str, or UTF-8 bytes as read off the wire)
         source_type: Type of source (trustpilot, yelp, etc.)
         brand_name: Brand being searched
     
     Returns:
         List of structured data dicts with standardized format
     """
-    current_date = datetime.now()
-    today_str = current_date.strftime("%m-%d-%Y")
-    yesterday_str = (current_date - timedelta(days=1)).strftime("%m-%d-%Y")
-    three_days_ago_str = (current_date - timedelta(days=3)).strftime("%m-%d-%Y")
+    if isinstance(raw_answer, bytes):
+        raw_answer = raw_answer.decode('utf-8', errors='replace')
     
-    print(f"\n[LLM PROCESSOR] Processing {source_type} data for {brand_name}")
-    print(f"[LLM PROCESSOR] Raw data length: {len(raw_answer)} chars")
+    date_fields = _date_fields()
+    today_str = date_fields["today"]
+    
+    logger.debug("Processing %s data for %s (%d chars)", source_type, brand_name, len(raw_answer))
+    
+    cache_key = _llm_cache_key(raw_answer, source_type, brand_name, today_str)
+    cached = await _cache_get(cache_key)
+    if cached is not None:
+        logger.debug("Cache hit for %s, skipping LLM call", source_type)
+        return cached
+    
+    # Fast path: the agent already answered with items in our shape
+    structured = _parse_structured_answer(raw_answer)
+    if structured is not None:
+        logger.debug("%s answer is already structured JSON, skipping LLM call", source_type)
+        return _clean_items(structured, today_str)
     
     # Build prompt for LLM
-    prompt = LLM_FORMAT_PROMPT.format(
+    prompt = fill_template(
+        _PROMPT_PARTS,
         source_type=source_type,
         brand_name=brand_name,
-        raw_data=raw_answer[:8000],  # Limit size to avoid token limits
-        current_date=today_str,
-        today=today_str,
-        yesterday=yesterday_str,
-        three_days_ago=three_days_ago_str
+        raw_data=_compact_raw_data(raw_answer),  # Limit size to avoid token limits
+        **date_fields
     )
     
     # Call LLM
     try:
-        print(f"[LLM PROCESSOR] Calling LLM for formatting...")
-        llm_response = respond(prompt)
-        print(f"[LLM PROCESSOR] LLM response received ({len(llm_response)} chars)")
+        logger.debug("Calling LLM for formatting %s", source_type)
+        llm_response = await respond_async(prompt)
+        logger.debug("LLM response received (%d chars)", len(llm_response))
         
         # Extract JSON from response (handle markdown code blocks)
         json_str = llm_response.strip()
         
         # Remove markdown code blocks if present
-        if "```json" in json_str:
-            json_str = re.sub(r'```json\s*', '', json_str)
-        if "```" in json_str:
-            json_str = re.sub(r'```\s*', '', json_str)
-        
-        json_str = json_str.strip()
-        
-        # Try to find JSON array in the response
-        # Look for [ ... ] pattern
-        match = re.search(r'\[.*\]', json_str, re.DOTALL)
-        if match:
-            json_str = match.group(0)
+        json_str = _MD_JSON_RE.sub('', json_str).strip()
         
-        print(f"[LLM PROCESSOR] Parsing JSON...")
-        # Parse JSON
-        data = json.loads(json_str)
+        # Parse the JSON array (or single object) out of the response
+        data = _extract_json(json_str)
         
         if not isinstance(data, list):
             data = [data]
         
-        print(f"[LLM PROCESSOR] ✅ Successfully extracted {len(data)} items")
+        logger.debug("Extracted %d %s items", len(data), source_type)
         
-        # Validate and clean data
-        cleaned_data = []
-        for item in data:
-            if isinstance(item, dict):
-                # Ensure date is in correct format
-                date = item.get('date', today_str)
-                if not re.match(r'\d{2}-\d{2}-\d{4}', date):
-                    # Try to fix common formats
-                    print(f"[LLM PROCESSOR] Warning: Invalid date format '{date}', using today")
-                    item['date'] = today_str
-                
-                # Ensure sentiment_score is in range
-                score = item.get('sentiment_score', 0.0)
-                try:
-                    score = float(score)
-                    score = max(-1.0, min(1.0, score))
-                    item['sentiment_score'] = score
-                except:
-                    item['sentiment_score'] = 0.0
-                
-                cleaned_data.append(item)
+        cleaned_data = _clean_items(data, today_str)
+        await _cache_put(cache_key, cleaned_data)
         
         return cleaned_data
     
     except json.JSONDecodeError as e:
-        print(f"[LLM PROCESSOR] ❌ JSON parsing failed: {e}")
-        print(f"[LLM PROCESSOR] LLM response preview: {llm_response[:500] if 'llm_response' in locals() else 'N/A'}")
+        logger.error("JSON parsing failed for %s: %s; LLM response preview: %.500s", source_type, e, llm_response)
         return []
     
     except Exception as e:
-        print(f"[LLM PROCESSOR] ❌ LLM processing failed: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("LLM processing failed for %s", source_type)
         return []
+
+
+def process_with_llm(
+    raw_answer: Union[str, bytes],
+    source_type: str,
+    brand_name: str
+) -> List[Dict[str, Any]]:
+    """
+    Blocking wrapper around process_with_llm_async for worker threads.
+    
+    Args:
+        raw_answer: Raw response from Browser.cash (str, or UTF-8 bytes as read off the wire)
+        source_type: Type of source (trustpilot, yelp, etc.)
+        brand_name: Brand being searched
+    
+    Returns:
+        List of structured data dicts with standardized format
+    """
+    return run_async(process_with_llm_async(raw_answer, source_type, brand_name))
+
+
+async def _process_batch(
+    answers: Dict[str, str],
+    brand_name: str,
+    date_fields: Dict[str, str]
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Format several sources' answers with a single LLM call.
+    
+    Args:
+        answers: Decoded raw answer per source type
+        brand_name: Brand being searched
+        date_fields: Output of _date_fields()
+    
+    Returns:
+        Cleaned items for every source the response covered with a JSON
+        array; sources it missed (or all of them, if the call failed) are
+        left out so the caller can retry them individually
+    """
+    raw_blocks = ''.join(
+        f"\n=== SOURCE: {source} ===\n```\n{_compact_raw_data(raw)}\n```\n"
+        for source, raw in answers.items()
+    )
+    prompt = fill_template(
+        _BATCH_PROMPT_PARTS,
+        brand_name=brand_name,
+        raw_blocks=raw_blocks,
+        source_keys=', '.join(answers),
+        **date_fields
+    )
+    
+    try:
+        logger.debug("Calling LLM once for %d sources: %s", len(answers), ', '.join(answers))
+        llm_response = await respond_async(prompt)
+        data = _extract_json(_MD_JSON_RE.sub('', llm_response.strip()).strip(), openers='{')
+    except Exception:
+        logger.warning("Batched LLM call failed, falling back to per-source calls", exc_info=True)
+        return {}
+    
+    if not isinstance(data, dict):
+        logger.warning("Batched LLM response was not a JSON object, falling back to per-source calls")
+        return {}
+    
+    results = {}
+    for source in answers:
+        items = data.get(source)
+        if isinstance(items, list):
+            results[source] = _clean_items(items, date_fields["today"])
+    return results
+
+
+async def process_all(
+    answers: Dict[str, Union[str, bytes]],
+    brand_name: str
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Format several sources' raw answers, sharing one LLM call where possible.
+    
+    Cached and already-structured answers skip the LLM. The rest go out in a
+    single batched call; any source it fails to cover is retried with
+    concurrent per-source calls.
+    
+    Args:
+        answers: Raw Browser.cash answer per source type
+        brand_name: Brand being searched
+    
+    Returns:
+        Structured data list per source type (empty list if a source failed)
+    """
+    date_fields = _date_fields()
+    today_str = date_fields["today"]
+    
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    pending: Dict[str, str] = {}
+    cache_keys: Dict[str, str] = {}
+    
+    for source, raw_answer in answers.items():
+        if isinstance(raw_answer, bytes):
+            raw_answer = raw_answer.decode('utf-8', errors='replace')
+        
+        cache_keys[source] = _llm_cache_key(raw_answer, source, brand_name, today_str)
+        cached = await _cache_get(cache_keys[source])
+        structured = _parse_structured_answer(raw_answer) if cached is None else None
+        
+        if cached is not None:
+            results[source] = cached
+        elif structured is not None:
+            results[source] = _clean_items(structured, today_str)
+        else:
+            pending[source] = raw_answer
+    
+    if len(pending) > 1:
+        batched = await _process_batch(pending, brand_name, date_fields)
+        for source, cleaned_data in batched.items():
+            await _cache_put(cache_keys[source], cleaned_data)
+            results[source] = cleaned_data
+            del pending[source]
+    
+    sources = list(pending)
+    fallback = await asyncio.gather(*[
+        process_with_llm_async(pending[source], source, brand_name)
+        for source in sources
+    ])
+    results.update(zip(sources, fallback))
+    
+    # Keep the caller's source order
+    return {source: results[source] for source in answers}
@@ -1,3 +1,7 @@
+from functools import lru_cache
+from string import Formatter
+from typing import Callable, Dict, Optional, Tuple
+
 PROMPTS = {
     "trustpilot": """
 Go to Trustpilot and search for "{brand_name}". 
@@ -92,6 +96,47 @@ Provide all the information you find from the website.
 }
 
 
+def split_template(template: str) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """
+    Split a str.format template once into (literal, field) pairs for fill_template.
+    
+    Templates are parsed once up front, so building a prompt is a join rather
+    than a str.format re-scan of the whole template.
+    """
+    return tuple(
+        (literal, field) for literal, field, _, _ in Formatter().parse(template)
+    )
+
+
+def fill_template(parts: Tuple[Tuple[str, Optional[str]], ...], **fields: str) -> str:
+    """Fill a pre-split template (same output as .format on the original)."""
+    return ''.join(
+        literal + fields[field] if field is not None else literal
+        for literal, field in parts
+    )
+
+
+def _compile(template: str) -> Callable[[str, str], str]:
+    """Pre-split a prompt template into a builder taking (brand_name, website_url)."""
+    parts = split_template(template)
+    
+    def build(brand_name: str, website_url: str) -> str:
+        return fill_template(parts, brand_name=brand_name, website_url=website_url)
+    
+    return build
+
+
+PROMPT_FUNCS: Dict[str, Callable[[str, str], str]] = {
+    source_type: _compile(template) for source_type, template in PROMPTS.items()
+}
+
+
+@lru_cache(maxsize=256)
+def _default_website_url(brand_name: str) -> str:
+    """Guess a brand's website when none was given."""
+    return f"www.{brand_name.lower().replace(' ', '')}.com"
+
+
 def get_prompt(source_type: str, brand_name: str, website_url: str = "") -> str:
     """
     Get the appropriate prompt for a given source type.
@@ -104,10 +149,8 @@ def get_prompt(source_type: str, brand_name: str, website_url: str = "") -> str:
     Returns:
         Formatted prompt string
     """
-    if source_type not in PROMPTS:
+    build = PROMPT_FUNCS.get(source_type)
+    if build is None:
         return f"Search for information about {brand_name} on {source_type}"
     
-    return PROMPTS[source_type].format(
-        brand_name=brand_name,
-        website_url=website_url or f"www.{brand_name.lower().replace(' ', '')}.com"
-    )
+    return build(brand_name, website_url or _default_website_url(brand_name))
@@ -1,11 +1,44 @@
+import hashlib
 import json
+import logging
 import time
 import re
+import orjson
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from browser import create_task, get_task
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Sequence
+from browser import create_task, get_task, list_tasks
 from .prompts import get_prompt
-from db.models import ReputationEntry
+from db.models import ReputationEntry, is_mmddyyyy, REVIEW_SOURCES, ARTICLE_SOURCES, SCRAPE_SOURCES
+
+
+logger = logging.getLogger(__name__)
+
+
+# Shared pool for concurrent Browser.cash calls (network-bound, one per source)
+_browser_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="clarity-browser")
+
+LIST_PAGE_SIZE = 100
+LIST_MAX_PAGES = 3  # our tasks are recent; older ones fall back to get_task
+
+
+# Keywords match whole words ('bad' no longer matches inside 'badge');
+# multi-word phrases are checked separately as substrings
+_POSITIVE_KEYWORDS = frozenset((
+    'excellent', 'great', 'amazing', 'fantastic', 'wonderful',
+    'love', 'best', 'outstanding', 'perfect',
+    'impressed', 'satisfied', 'happy', 'good', 'positive'
+))
+_POSITIVE_PHRASES = ('highly recommend',)
+
+_NEGATIVE_KEYWORDS = frozenset((
+    'terrible', 'awful', 'horrible', 'worst', 'bad', 'poor',
+    'disappointed', 'waste', 'scam', 'fraud', 'avoid', 'never',
+    'unhappy', 'unsatisfied', 'negative', 'problem', 'issue'
+))
+
+_WORD_RE = re.compile(r"[a-z]+")
 
 
 def calculate_reputation_score(text: str, rating: Optional[float] = None) -> float:
@@ -19,76 +52,153 @@ def calculate_reputation_score(text: str, rating: Optional[float] = None) -> flo
     Returns:
         Score between -1.0 (very negative) and 1.0 (very positive)
     """
+    # str.lower has a C fast path for ASCII; a str.translate table is ~10x slower
     text_lower = text.lower()
     
-    positive_keywords = [
-        'excellent', 'great', 'amazing', 'fantastic', 'wonderful',
-        'love', 'best', 'outstanding', 'perfect', 'highly recommend',
-        'impressed', 'satisfied', 'happy', 'good', 'positive'
-    ]
-    
-    negative_keywords = [
-        'terrible', 'awful', 'horrible', 'worst', 'bad', 'poor',
-        'disappointed', 'waste', 'scam', 'fraud', 'avoid', 'never',
-        'unhappy', 'unsatisfied', 'negative', 'problem', 'issue'
-    ]
-    
-    positive_count = sum(1 for word in positive_keywords if word in text_lower)
-    negative_count = sum(1 for word in negative_keywords if word in text_lower)
-    
-    if rating is not None:
-        if rating >= 4:
-            base_score = 0.6 + (rating - 4) * 0.4
-        elif rating >= 3:
-            base_score = 0.0
-        else:
-            base_score = -0.4 - (3 - rating) * 0.3
-    else:
-        base_score = 0.0
+    # Each distinct keyword counts once, however often it occurs
+    words = set(_WORD_RE.findall(text_lower))
+    positive_count = len(words & _POSITIVE_KEYWORDS) + sum(
+        1 for phrase in _POSITIVE_PHRASES if phrase in text_lower
+    )
+    negative_count = len(words & _NEGATIVE_KEYWORDS)
+    
+    return _score_from(positive_count, negative_count, rating)
+
+
+def calculate_reputation_scores(
+    texts: Sequence[str],
+    ratings: Optional[Sequence[Optional[float]]] = None
+) -> List[float]:
+    """
+    Score many texts in one call, e.g. when re-scoring stored entries.
+    
+    Same result as calculate_reputation_score per text, with the keyword
+    sets and regex bound once and the rating part computed once per
+    distinct rating.
+    
+    Args:
+        texts: Texts to analyze
+        ratings: Optional star ratings (1-5 scale), one per text
+    
+    Returns:
+        Scores between -1.0 and 1.0, in input order
+    """
+    if ratings is None:
+        ratings = [None] * len(texts)
+    elif len(ratings) != len(texts):
+        raise ValueError("ratings must have one entry per text")
     
-    sentiment_adjustment = (positive_count - negative_count) * 0.1
-    final_score = base_score + sentiment_adjustment
+    findall = _WORD_RE.findall
+    positive, negative, phrases = _POSITIVE_KEYWORDS, _NEGATIVE_KEYWORDS, _POSITIVE_PHRASES
+    base_scores: Dict[Optional[float], float] = {}
+    scores = []
     
-    return max(-1.0, min(1.0, final_score))
+    for text, rating in zip(texts, ratings):
+        base_score = base_scores.get(rating)
+        if base_score is None:
+            base_score = base_scores[rating] = _rating_base(rating)
+        
+        text_lower = text.lower()
+        words = set(findall(text_lower))
+        net = len(words & positive) - len(words & negative)
+        net += sum(1 for phrase in phrases if phrase in text_lower)
+        
+        final_score = base_score + net * 0.1
+        scores.append(1.0 if final_score > 1.0 else -1.0 if final_score < -1.0 else final_score)
+    
+    return scores
+
+
+def _rating_base(rating: Optional[float]) -> float:
+    """Unclamped base score for an optional 1-5 star rating (the clamp applies after keywords)."""
+    if rating is None or 3 <= rating < 4:
+        return 0.0
+    if rating >= 4:
+        return 0.6 + (rating - 4) * 0.4
+    return -0.4 - (3 - rating) * 0.3
+
+
+def _score_from(positive_count: int, negative_count: int, rating: Optional[float]) -> float:
+    """Combine keyword counts and an optional 1-5 star rating into a clamped [-1, 1] score."""
+    final_score = _rating_base(rating) + (positive_count - negative_count) * 0.1
+    
+    if final_score > 1.0:
+        return 1.0
+    if final_score < -1.0:
+        return -1.0
+    return final_score
+
+
+# Tried in order; earlier formats win for ambiguous dates like 05/11/2025
+_DATE_FORMATS = (
+    "%Y-%m-%d",      # 2025-11-15
+    "%m/%d/%Y",      # 11/15/2025
+    "%d/%m/%Y",      # 15/11/2025
+    "%Y/%m/%d",      # 2025/11/15
+    "%m-%d-%Y",      # Already correct
+    "%B %d, %Y",     # November 15, 2025
+    "%b %d, %Y",     # Nov 15, 2025
+    "%Y-%m-%dT%H:%M:%S",  # ISO format with time
+    "%Y-%m-%d %H:%M:%S",   # SQL datetime
+)
 
 
-def _normalize_date_format(date_str: str) -> str:
+@lru_cache(maxsize=1024)
+def _convert_date(date_str: str) -> Optional[str]:
+    """
+    Convert a date in one of _DATE_FORMATS to MM-DD-YYYY, or None if none match.
+    
+    Memoized per string: an LLM batch repeats the same few dates, so each
+    distinct string goes through the strptime loop once.
+    """
+    # YYYY-MM-DD, the first format and the usual miss: reorder the slices
+    if (
+        len(date_str) == 10
+        and date_str[4] == '-'
+        and date_str[7] == '-'
+        and date_str.isascii()
+        and date_str[:4].isdigit()
+        and date_str[5:7].isdigit()
+        and date_str[8:].isdigit()
+    ):
+        try:
+            datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
+        except ValueError:
+            return None
+        return f"{date_str[5:7]}-{date_str[8:]}-{date_str[:4]}"
+    
+    for fmt in _DATE_FORMATS:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return dt.strftime("%m-%d-%Y")  # Always return MM-DD-YYYY
+        except ValueError:
+            continue
+    
+    return None
+
+
+def _normalize_date_format(date_str: str, today: Optional[str] = None) -> str:
     """
     Normalize any date format to MM-DD-YYYY.
     
     Args:
         date_str: Date in any format
+        today: Fallback MM-DD-YYYY date if date_str can't be parsed (default: now)
     
     Returns:
         Date in MM-DD-YYYY format
     """
     # Already in correct format
-    if re.match(r'^\d{2}-\d{2}-\d{4}$', date_str):
+    if is_mmddyyyy(date_str):
         return date_str
     
-    # Try common formats
-    formats_to_try = [
-        "%Y-%m-%d",      # 2025-11-15
-        "%m/%d/%Y",      # 11/15/2025
-        "%d/%m/%Y",      # 15/11/2025
-        "%Y/%m/%d",      # 2025/11/15
-        "%m-%d-%Y",      # Already correct
-        "%B %d, %Y",     # November 15, 2025
-        "%b %d, %Y",     # Nov 15, 2025
-        "%Y-%m-%dT%H:%M:%S",  # ISO format with time
-        "%Y-%m-%d %H:%M:%S",   # SQL datetime
-    ]
-    
-    for fmt in formats_to_try:
-        try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.strftime("%m-%d-%Y")  # Always return MM-DD-YYYY
-        except ValueError:
-            continue
+    normalized = _convert_date(date_str)
+    if normalized is not None:
+        return normalized
     
     # If all else fails, use today
-    print(f"[PARSER] ❌ Could not parse date '{date_str}', using today")
-    return datetime.now().strftime("%m-%d-%Y")
+    logger.warning("Could not parse date %r, using today", date_str)
+    return today or datetime.now().strftime("%m-%d-%Y")
 
 
 def parse_scrape_result(
@@ -111,43 +221,113 @@ def parse_scrape_result(
     """
     from .llm_processor import process_with_llm
     
-    entries = []
-    scraped_at = datetime.now().isoformat()
-    
-    print(f"\n[PARSER] Processing {source_type} results for {brand_name}")
+    logger.debug("Processing %s results for %s", source_type, brand_name)
     
     # Use LLM to process and format the raw data
     structured_data = process_with_llm(raw_result, source_type, brand_name)
     
+    return _build_entries(structured_data, source_type, source_url)
+
+
+def parse_scrape_results(
+    raw_results: Dict[str, str],
+    brand_name: str = "",
+    source_urls: Optional[Dict[str, str]] = None
+) -> Dict[str, List[ReputationEntry]]:
+    """
+    Parse several sources' browser.cash results with concurrent LLM calls.
+    
+    Args:
+        raw_results: Raw answer from browser.cash per source type
+        brand_name: Brand name for context
+        source_urls: Base URL per source type (defaults to "")
+    
+    Returns:
+        List of ReputationEntry objects per source type
+    """
+    from ai.llm import run_async
+    from .llm_processor import process_all
+    
+    source_urls = source_urls or {}
+    
+    logger.debug("Processing %s results for %s", ', '.join(raw_results), brand_name)
+    
+    structured = run_async(process_all(raw_results, brand_name))
+    
+    return {
+        source_type: _build_entries(data, source_type, source_urls.get(source_type, ""))
+        for source_type, data in structured.items()
+    }
+
+
+def _item_json(item: Dict[str, Any]) -> str:
+    """Compact JSON for an entry's raw_data (orjson; stdlib only for values orjson rejects, e.g. >64-bit ints)."""
+    try:
+        return orjson.dumps(item).decode()
+    except TypeError:
+        return json.dumps(item, separators=(',', ':'))
+
+
+# Leading characters of an item's text that identify a duplicate (syndicated review, boilerplate blurb)
+DEDUPE_PREFIX_CHARS = 512
+
+
+def _item_digest(item: Dict[str, Any]) -> Optional[bytes]:
+    """Hash of an item's leading review text (or summary), or None if it has no text."""
+    text = item.get('review_text') or item.get('summary')
+    if not text or not isinstance(text, str):
+        return None
+    return hashlib.blake2b(text[:DEDUPE_PREFIX_CHARS].encode('utf-8', errors='replace'), digest_size=16).digest()
+
+
+def _build_entries(
+    structured_data: List[Dict[str, Any]],
+    source_type: str,
+    source_url: str
+) -> List[ReputationEntry]:
+    """Turn one source's LLM-formatted items into ReputationEntry objects, skipping repeated texts."""
+    entries = []
+    seen = set()
+    now = datetime.now()
+    scraped_at = now.isoformat()
+    today = now.strftime("%m-%d-%Y")  # fallback for items without a usable date
+    
     if not structured_data:
-        print(f"[PARSER] ⚠️ No data extracted from {source_type}")
+        logger.warning("No data extracted from %s", source_type)
         return []
     
-    print(f"[PARSER] Processing {len(structured_data)} items from LLM")
+    logger.debug("Processing %d items from LLM", len(structured_data))
     
     for idx, item in enumerate(structured_data, 1):
         try:
+            digest = _item_digest(item)
+            if digest is not None:
+                if digest in seen:
+                    logger.debug("Entry %d duplicates an earlier item, skipping", idx)
+                    continue
+                seen.add(digest)
+            
             # LLM provides clean, structured data
-            if source_type in ['trustpilot', 'yelp', 'google_reviews']:
+            if source_type in REVIEW_SOURCES:
                 summary = item.get('summary', item.get('review_text', '')[:200])
                 reputation_score = item.get('sentiment_score', 0.0)
-                date = item.get('date', datetime.now().strftime("%m-%d-%Y"))
+                date = item.get('date', today)
                 url = item.get('url', source_url)
                 
-            elif source_type in ['news', 'blog', 'forum', 'website']:
+            elif source_type in ARTICLE_SOURCES:
                 summary = item.get('summary', '')
                 reputation_score = item.get('sentiment_score', 0.0)
-                date = item.get('date', datetime.now().strftime("%m-%d-%Y"))
+                date = item.get('date', today)
                 url = item.get('url', source_url)
             
             else:
-                print(f"[PARSER] Unknown source type: {source_type}")
+                logger.warning("Unknown source type: %s", source_type)
                 continue
             
             # VALIDATE: Ensure date is in MM-DD-YYYY format
-            if not re.match(r'^\d{2}-\d{2}-\d{4}$', date):
-                print(f"[PARSER] ⚠️ Invalid date format '{date}', converting...")
-                date = _normalize_date_format(date)
+            if not is_mmddyyyy(date):
+                logger.debug("Invalid date format %r, converting", date)
+                date = _normalize_date_format(date, today)
             
             entry = ReputationEntry(
                 date=date,  # Guaranteed MM-DD-YYYY format
@@ -156,19 +336,54 @@ def parse_scrape_result(
                 reputation_score=reputation_score,  # From LLM sentiment analysis
                 summary=summary,
                 scraped_at=scraped_at,
-                raw_data=json.dumps(item)
+                raw_data=_item_json(item)
             )
             entries.append(entry)
-            print(f"[PARSER] ✅ Entry {idx}: score={reputation_score:.2f}, date={date}")
+            logger.debug("Entry %d: score=%s, date=%s", idx, reputation_score, date)
         
         except Exception as e:
-            print(f"[PARSER] ❌ Failed to create entry {idx}: {e}")
+            logger.warning("Failed to create entry %d: %s", idx, e)
             continue
     
-    print(f"[PARSER] Successfully created {len(entries)} entries")
+    logger.debug("Created %d %s entries", len(entries), source_type)
     return entries
 
 
+def _create_source_task(
+    source: str,
+    brand_name: str,
+    website_url: str,
+    agent: str,
+    step_limit: int
+) -> Optional[Dict[str, Any]]:
+    """Create the Browser.cash task for one source (pool thread). Returns its task info, or None if no taskId came back."""
+    try:
+        prompt = get_prompt(source, brand_name, website_url)
+        
+        response = create_task(
+            agent=agent,
+            prompt=prompt,
+            mode="text",
+            step_limit=step_limit
+        )
+        
+        task_id = response.get("taskId")
+        if task_id:
+            return {
+                "task_id": task_id,
+                "status": "created",
+                "source": source
+            }
+        return None
+    
+    except Exception as e:
+        return {
+            "error": str(e),
+            "status": "failed",
+            "source": source
+        }
+
+
 def scrape_brand(
     brand_name: str,
     sources: List[str],
@@ -189,36 +404,20 @@ def scrape_brand(
     Returns:
         Dictionary with task_ids and status for each source
     """
-    task_ids = {}
+    # Keep the caller's order; sources arrive as a list from the request body
+    valid_sources = [source for source in sources if source in SCRAPE_SOURCES]
     
-    for source in sources:
-        if source not in ['trustpilot', 'yelp', 'google_reviews', 'news', 'blog', 'forum', 'website']:
-            continue
-        
-        try:
-            prompt = get_prompt(source, brand_name, website_url)
-            
-            response = create_task(
-                agent=agent,
-                prompt=prompt,
-                mode="text",
-                step_limit=step_limit
-            )
-            
-            task_id = response.get("taskId")
-            if task_id:
-                task_ids[source] = {
-                    "task_id": task_id,
-                    "status": "created",
-                    "source": source
-                }
-        
-        except Exception as e:
-            task_ids[source] = {
-                "error": str(e),
-                "status": "failed",
-                "source": source
-            }
+    # One create_task POST per source, issued concurrently: wall time is the
+    # slowest round trip instead of the sum
+    created = _browser_pool.map(
+        lambda source: _create_source_task(source, brand_name, website_url, agent, step_limit),
+        valid_sources
+    )
+    
+    task_ids = {}
+    for source, task_info in zip(valid_sources, created):
+        if task_info is not None:
+            task_ids[source] = task_info
     
     return {
         "brand_name": brand_name,
@@ -228,73 +427,153 @@ def scrape_brand(
     }
 
 
-def check_scraping_status(task_ids: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+def _list_our_tasks(wanted: set) -> Dict[str, Dict[str, Any]]:
     """
-    Check the status of scraping tasks.
+    Fetch task states in bulk via list_tasks, one page per round trip.
     
     Args:
-        task_ids: Dictionary of task information from scrape_brand
+        wanted: Browser.cash task ids to look for
     
     Returns:
-        Dictionary with updated status for each task
+        Dict of task_id -> task for the wanted tasks found in the listing
+        (empty if listing fails; callers fall back to get_task)
     """
-    results = {}
+    found = {}
     
-    for source, task_info in task_ids.items():
-        if "task_id" not in task_info:
-            results[source] = task_info
-            continue
-        
-        try:
-            task_id = task_info["task_id"]
-            response = get_task(task_id)
+    try:
+        for page in range(1, LIST_MAX_PAGES + 1):
+            tasks = list_tasks(page_size=LIST_PAGE_SIZE, page=page).get("tasks") or []
             
-            # Get actual Browser.cash status and answer
-            # Browser.cash API returns "state" (not "status") and answer is nested in "result"
-            browser_status = response.get("state")  # "active", "completed", "failed"
-            result = response.get("result") or {}
-            answer = result.get("answer")  # Answer is nested inside result
+            for task in tasks:
+                if task.get("taskId") in wanted:
+                    found[task["taskId"]] = task
             
-            # DEBUG: Print actual response from Browser.cash
-            print(f"\n[DEBUG {source}] Task ID: {task_id}")
-            print(f"[DEBUG {source}] Browser.cash status: {browser_status}")
-            print(f"[DEBUG {source}] Has answer field: {'answer' in response}")
-            if answer:
-                answer_preview = str(answer)[:100] + "..." if len(str(answer)) > 100 else str(answer)
-                print(f"[DEBUG {source}] Answer preview: {answer_preview}")
-            
-            # Check BOTH: status must be "completed" AND answer must exist
-            if browser_status == "completed" and answer:
-                results[source] = {
-                    "status": "completed",
-                    "source": source,
-                    "task_id": task_id,
-                    "answer": answer
-                }
-                print(f"[DEBUG {source}] ✅ Marked as completed with answer")
-            elif browser_status == "failed":
-                results[source] = {
-                    "status": "failed",
-                    "source": source,
-                    "task_id": task_id,
-                    "error": response.get("error", "Task failed")
-                }
-                print(f"[DEBUG {source}] ❌ Task failed")
-            else:
-                # Still active/processing
-                results[source] = {
-                    "status": browser_status or "active",
-                    "source": source,
-                    "task_id": task_id
-                }
-                print(f"[DEBUG {source}] ⏳ Still {browser_status or 'active'}")
+            if len(found) == len(wanted) or len(tasks) < LIST_PAGE_SIZE:
+                break
+    except Exception as e:
+        logger.warning("list_tasks failed, checking tasks individually: %s", e)
+    
+    return found
+
+
+# Listing states that settle a poll without get_task (a completed task also needs its answer)
+_SETTLED_LISTED_STATES = frozenset(("active", "failed"))
+
+
+def _needs_fetch(listed: Optional[Dict[str, Any]]) -> bool:
+    """
+    Whether a task must be fetched with get_task instead of trusting its list_tasks item.
+    
+    The listing's item shape is undocumented, so only a known state is
+    trusted: active, failed, or completed with its answer included.
+    Anything else (missing task, no or unknown state) is fetched.
+    """
+    if listed is None:
+        return True
+    
+    state = listed.get("state")
+    if state in _SETTLED_LISTED_STATES:
+        return False
+    return not (state == "completed" and (listed.get("result") or {}).get("answer"))
+
+
+def _check_source_task(
+    source: str,
+    task_info: Dict[str, Any],
+    listed: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Fetch and interpret the Browser.cash task for one source (pool thread).
+    
+    Args:
+        source: Source type
+        task_info: Task info from scrape_brand
+        listed: The task as returned by list_tasks, if it was found there
+    """
+    if "task_id" not in task_info:
+        return task_info
+    
+    try:
+        task_id = task_info["task_id"]
         
-        except Exception as e:
-            results[source] = {
-                "status": "error",
+        response = get_task(task_id) if _needs_fetch(listed) else listed
+        
+        # Get actual Browser.cash status and answer
+        # Browser.cash API returns "state" (not "status") and answer is nested in "result"
+        browser_status = response.get("state")  # "active", "completed", "failed"
+        result = response.get("result") or {}
+        answer = result.get("answer")  # Answer is nested inside result
+        
+        # Per-poll detail; the answer preview is only built when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "[%s] task %s: Browser.cash state=%s, has answer=%s, preview=%.100r",
+                source, task_id, browser_status, bool(answer), answer
+            )
+        
+        # Check BOTH: status must be "completed" AND answer must exist
+        if browser_status == "completed" and answer:
+            return {
+                "status": "completed",
                 "source": source,
-                "error": str(e)
+                "task_id": task_id,
+                "answer": answer
             }
-            print(f"[DEBUG {source}] ❌ Error: {e}")
+        elif browser_status == "failed":
+            return {
+                "status": "failed",
+                "source": source,
+                "task_id": task_id,
+                "error": response.get("error", "Task failed")
+            }
+        else:
+            # Still active/processing
+            return {
+                "status": browser_status or "active",
+                "source": source,
+                "task_id": task_id
+            }
+    
+    except Exception as e:
+        logger.warning("[%s] status check failed: %s", source, e)
+        return {
+            "status": "error",
+            "source": source,
+            "error": str(e)
+        }
+
+
+def check_scraping_status(task_ids: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Check the status of scraping tasks.
+    
+    Args:
+        task_ids: Dictionary of task information from scrape_brand
     
-    return results
+    Returns:
+        Dictionary with updated status for each task
+    """
+    # One list_tasks round trip covers every source; anything it misses is
+    # fetched with get_task, concurrently
+    wanted = {info["task_id"] for info in task_ids.values() if "task_id" in info}
+    listed = _list_our_tasks(wanted) if wanted else {}
+    
+    results = {}
+    to_fetch = []
+    for source, info in task_ids.items():
+        task = listed.get(info.get("task_id"))
+        if "task_id" in info and _needs_fetch(task):
+            to_fetch.append(source)
+        else:
+            # Resolved from the listing: no network, so no pool hand-off
+            results[source] = _check_source_task(source, info, task)
+    
+    if to_fetch:
+        fetched = _browser_pool.map(
+            lambda source: _check_source_task(source, task_ids[source], listed.get(task_ids[source]["task_id"])),
+            to_fetch
+        )
+        results.update(zip(to_fetch, fetched))
+    
+    return {source: results[source] for source in task_ids}
+
@@ -6,12 +6,20 @@ This script demonstrates the async search pattern using Browser.cash:
 2. Poll for results (GET /search/{search_id}) - check status and get results
 """
 
+import orjson
 import requests
-import json
+import random
 import time
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "http://localhost:8000"
 
+# One keep-alive connection for the initial POST and every status poll
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+session.headers.update({"Content-Type": "application/json"})
+
 print("=" * 60)
 print("CLARITY AGENTIC SEARCH - Browser.cash Integration")
 print("=" * 60)
@@ -22,21 +30,20 @@ print(f"POST {BASE_URL}/search\n")
 
 try:
     # Start the search
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/search",
         json={
             "query": "Nike",
             "sources": ["trustpilot", "yelp", "google_reviews", "news"],
             "auto_save": True,
             "website_url": "https://nike.com"
-        },
-        headers={"Content-Type": "application/json"}
+        }
     )
     
     print(f"Status Code: {response.status_code}")
     
     if response.status_code == 202:
-        result = response.json()
+        result = orjson.loads(response.content)
         search_id = result["search_id"]
         
         print("\n✅ Search initiated successfully!")
@@ -55,17 +62,20 @@ try:
         print("=" * 60)
         
         max_attempts = 60
-        poll_interval = 5
+        base_interval = 2
+        max_interval = 15
         attempt = 0
+        idle_polls = 0  # consecutive polls with no new completed sources
+        last_completed = 0
         
         while attempt < max_attempts:
             attempt += 1
             print(f"\n[Attempt {attempt}] Checking status...")
             
-            status_response = requests.get(f"{BASE_URL}/search/{search_id}")
+            status_response = session.get(f"{BASE_URL}/search/{search_id}")
             
             if status_response.status_code == 200:
-                data = status_response.json()
+                data = orjson.loads(status_response.content)
                 status = data["status"]
                 
                 if status == "completed":
@@ -101,6 +111,12 @@ try:
                     
                     print(f"   Status: Processing ({completed}/{total} sources complete)")
                     
+                    # Back off while nothing moves; snap back once a source completes
+                    idle_polls = 0 if completed > last_completed else idle_polls + 1
+                    last_completed = completed
+                    poll_interval = min(max_interval, base_interval * 1.5 ** idle_polls)
+                    poll_interval *= random.uniform(0.9, 1.1)
+                    
                     for source, source_status in sources.items():
                         # Better emoji mapping based on status
                         if source_status == "completed":
@@ -113,7 +129,7 @@ try:
                             emoji = "⏳"
                         print(f"      {emoji} {source}: {source_status}")
                     
-                    print(f"\n   Waiting {poll_interval} seconds before next check...")
+                    print(f"\n   Waiting {poll_interval:.1f} seconds before next check...")
                     time.sleep(poll_interval)
                 
                 elif status == "failed":